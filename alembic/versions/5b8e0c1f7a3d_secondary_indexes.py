@@ -0,0 +1,39 @@
+"""secondary indexes.
+
+Revision ID: 5b8e0c1f7a3d
+Revises: 4562f4f9291a
+Create Date: 2026-10-19 09:12:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e0c1f7a3d'
+down_revision = '4562f4f9291a'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_transaction_contract_id_block_number', 'transaction', ['contract_id', 'block_number']),
+    ('ix_token_owner_id', 'token', ['owner_id']),
+    ('ix_token_contract_id_token_id', 'token', ['contract_id', 'token_id']),
+    ('ix_limit_order_user_id', 'limit_order', ['user_id']),
+    ('ix_limit_order_token_id', 'limit_order', ['token_id']),
+    ('ix_account_stark_key', 'account', ['stark_key']),
+    ('ix_blueprint_minter_id', 'blueprint', ['minter_id']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,76 @@
+"""fixed width bytea.
+
+Revision ID: 6a2f8d4c1b97
+Revises: 3e1b7c9d0a42
+Create Date: 2026-10-19 16:48:37.204411
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from web3 import Web3
+
+
+# revision identifiers, used by Alembic.
+revision = '6a2f8d4c1b97'
+down_revision = '3e1b7c9d0a42'
+branch_labels = None
+depends_on = None
+
+HASHES = [('block', 'hash'), ('transaction', 'hash'), ('stark_contract', 'address')]
+ADDRESSES = [('token_contract', 'address'), ('account', 'address')]
+FELTS = [('account', 'stark_key'), ('token', 'token_id')]
+
+
+def upgrade():
+    op.execute('''
+        CREATE FUNCTION pg_temp.numeric_to_felt(n numeric) RETURNS bytea AS $$
+        DECLARE
+            h text := '';
+        BEGIN
+            WHILE n > 0 LOOP
+                h := lpad(to_hex(mod(n, 256)::int), 2, '0') || h;
+                n := div(n, 256);
+            END LOOP;
+            RETURN decode(lpad(h, 64, '0'), 'hex');
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE STRICT''')
+
+    for table, column in HASHES:
+        op.alter_column(table, column, type_=sa.LargeBinary(),
+                        postgresql_using=f"decode(lpad(substr({column}, 3), 64, '0'), 'hex')")
+    for table, column in ADDRESSES:
+        op.alter_column(table, column, type_=sa.LargeBinary(),
+                        postgresql_using=f"decode(lpad(substr({column}, 3), 40, '0'), 'hex')")
+    for table, column in FELTS:
+        op.alter_column(table, column, type_=sa.LargeBinary(),
+                        postgresql_using=f'pg_temp.numeric_to_felt({column})')
+
+
+def downgrade():
+    op.execute('''
+        CREATE FUNCTION pg_temp.felt_to_numeric(b bytea) RETURNS numeric AS $$
+        DECLARE
+            n numeric := 0;
+        BEGIN
+            FOR i IN 0 .. length(b) - 1 LOOP
+                n := n * 256 + get_byte(b, i);
+            END LOOP;
+            RETURN n;
+        END
+        $$ LANGUAGE plpgsql IMMUTABLE STRICT''')
+
+    for table, column in FELTS:
+        op.alter_column(table, column, type_=sa.Numeric(precision=80),
+                        postgresql_using=f'pg_temp.felt_to_numeric({column})')
+    conn = op.get_bind()
+    for table, column in ADDRESSES:
+        op.alter_column(table, column, type_=sa.String(),
+                        postgresql_using=f"'0x' || encode({column}, 'hex')")
+        # Checksum casing needs keccak, which postgres does not have.
+        for id_, address in conn.execute(sa.text(f'SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL')):
+            conn.execute(
+                sa.text(f'UPDATE {table} SET {column} = :address WHERE id = :id'),
+                {'id': id_, 'address': Web3.toChecksumAddress(address)})
+    for table, column in HASHES:
+        op.alter_column(table, column, type_=sa.String(),
+                        postgresql_using=f"'0x' || coalesce(nullif(ltrim(encode({column}, 'hex'), '0'), ''), '0')")
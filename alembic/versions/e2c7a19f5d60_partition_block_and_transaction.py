@@ -0,0 +1,154 @@
+"""partition block and transaction.
+
+Revision ID: e2c7a19f5d60
+Revises: b4d09e6f2c15
+Create Date: 2026-10-19 18:12:44.019237
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c7a19f5d60'
+down_revision = 'b4d09e6f2c15'
+branch_labels = None
+depends_on = None
+
+# Kept in step with fluence.partitions, which creates the partitions after these.
+BLOCKS_PER_PARTITION = 100000
+PENDING = sa.text("status NOT IN ('ACCEPTED_ON_L1', 'ACCEPTED_ONCHAIN')")
+BLOCK_COLUMNS = 'id, hash, timestamp, status'
+TRANSACTION_COLUMNS = ('id, hash, block_number, transaction_index, type, contract_id, '
+                       'entry_point_selector, entry_point_type, calldata')
+# The referencing column, and the column added to carry the partition key of the transaction along.
+TRANSACTION_REFERENCES = [('token', 'latest_tx_id', 'latest_tx_block_number', True),
+                          ('limit_order', 'tx_id', 'tx_block_number', False),
+                          ('limit_order', 'closed_tx_id', 'closed_tx_block_number', True),
+                          ('event', 'tx_id', 'block_number', False)]
+
+
+def set_aside():
+    # The sequence outlives the table it was created for.
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY NONE')
+    op.execute('ALTER TABLE "transaction" ALTER COLUMN id DROP DEFAULT')
+    op.rename_table('transaction', 'transaction_old')
+    op.rename_table('block', 'block_old')
+
+    # Frees the index names, and drops the foreign keys pointing at the old tables; upgrade and downgrade
+    # both recreate them against the new table.
+    op.execute('ALTER TABLE transaction_old DROP CONSTRAINT transaction_pkey CASCADE')
+    op.execute('ALTER TABLE block_old DROP CONSTRAINT block_pkey CASCADE')
+    op.execute('ALTER TABLE transaction_old DROP CONSTRAINT IF EXISTS transaction_hash_key')
+    op.execute('ALTER TABLE block_old DROP CONSTRAINT IF EXISTS block_hash_key')
+    op.execute('DROP INDEX IF EXISTS ix_transaction_hash')
+    op.execute('DROP INDEX IF EXISTS ix_block_hash')
+    op.drop_index('ix_transaction_contract_id_block_number', table_name='transaction_old')
+    op.drop_index('ix_block_id_pending', table_name='block_old')
+
+
+def restore_sequence():
+    op.execute("ALTER TABLE \"transaction\" ALTER COLUMN id SET DEFAULT nextval('transaction_id_seq')")
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY "transaction".id')
+
+
+def upgrade():
+    set_aside()
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('block',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('hash', sa.LargeBinary(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    postgresql_partition_by='RANGE (id)'
+    )
+    op.create_index('ix_block_hash', 'block', ['hash'], unique=False)
+    op.create_index('ix_block_id_pending', 'block', ['id'], unique=False, postgresql_where=PENDING)
+    op.create_table('transaction',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('hash', sa.LargeBinary(), nullable=False),
+    sa.Column('block_number', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('transaction_index', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('entry_point_selector', sa.String(), nullable=True),
+    sa.Column('entry_point_type', sa.String(), nullable=True),
+    sa.Column('calldata', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['block_number'], ['block.id'], ),
+    sa.ForeignKeyConstraint(['contract_id'], ['stark_contract.id'], ),
+    sa.PrimaryKeyConstraint('id', 'block_number'),
+    postgresql_partition_by='RANGE (block_number)'
+    )
+    op.create_index('ix_transaction_hash', 'transaction', ['hash'], unique=False)
+    op.create_index('ix_transaction_contract_id_block_number', 'transaction', ['contract_id', 'block_number'],
+                    unique=False)
+    # ### end Alembic commands ###
+
+    head = op.get_bind().execute(sa.text('SELECT max(id) FROM block_old')).scalar() or 0
+    for n in range(head // BLOCKS_PER_PARTITION + 2):
+        lo, hi = n * BLOCKS_PER_PARTITION, (n + 1) * BLOCKS_PER_PARTITION
+        for table in ['block', 'transaction']:
+            op.execute(f'CREATE TABLE "{table}_p{n}" PARTITION OF "{table}" FOR VALUES FROM ({lo}) TO ({hi})')
+
+    op.execute(f'INSERT INTO block ({BLOCK_COLUMNS}) SELECT {BLOCK_COLUMNS} FROM block_old')
+    op.execute(f'INSERT INTO "transaction" ({TRANSACTION_COLUMNS}) '
+               f'SELECT {TRANSACTION_COLUMNS} FROM transaction_old')
+    restore_sequence()
+
+    op.create_foreign_key(None, 'block_archive', 'block', ['block_id'], ['id'])
+    for table, column, block_column, nullable in TRANSACTION_REFERENCES:
+        op.add_column(table, sa.Column(block_column, sa.Integer(), nullable=True))
+        op.execute(f'UPDATE "{table}" SET {block_column} = t.block_number '
+                   f'FROM "transaction" t WHERE t.id = "{table}".{column}')
+        op.alter_column(table, block_column, nullable=nullable)
+        op.create_foreign_key(None, table, 'transaction', [column, block_column], ['id', 'block_number'])
+    op.drop_table('transaction_old')
+    op.drop_table('block_old')
+
+
+def downgrade():
+    set_aside()
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table('block',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('hash', sa.LargeBinary(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hash')
+    )
+    op.create_index('ix_block_id_pending', 'block', ['id'], unique=False, postgresql_where=PENDING)
+    op.create_table('transaction',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('hash', sa.LargeBinary(), nullable=False),
+    sa.Column('block_number', sa.Integer(), nullable=False),
+    sa.Column('transaction_index', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('entry_point_selector', sa.String(), nullable=True),
+    sa.Column('entry_point_type', sa.String(), nullable=True),
+    sa.Column('calldata', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['block_number'], ['block.id'], ),
+    sa.ForeignKeyConstraint(['contract_id'], ['stark_contract.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hash')
+    )
+    op.create_index('ix_transaction_contract_id_block_number', 'transaction', ['contract_id', 'block_number'],
+                    unique=False)
+    # ### end Alembic commands ###
+
+    op.execute(f'INSERT INTO block ({BLOCK_COLUMNS}) SELECT {BLOCK_COLUMNS} FROM block_old')
+    op.execute(f'INSERT INTO "transaction" ({TRANSACTION_COLUMNS}) '
+               f'SELECT {TRANSACTION_COLUMNS} FROM transaction_old')
+    restore_sequence()
+
+    op.create_foreign_key(None, 'block_archive', 'block', ['block_id'], ['id'])
+    for table, column, block_column, _nullable in TRANSACTION_REFERENCES:
+        op.drop_column(table, block_column)
+        op.create_foreign_key(None, table, 'transaction', [column], ['id'])
+    op.drop_table('transaction_old')
+    op.drop_table('block_old')
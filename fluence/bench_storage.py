@@ -0,0 +1,57 @@
+"""Reports the on-disk size and point-lookup latency of the hash, address and felt columns.
+
+Queries are plain SQL on raw column values, so the report can be taken on either side of the
+fixed-width bytea migration and compared.
+"""
+import asyncio
+import time
+
+import click
+from sqlalchemy import text
+
+COLUMNS = [
+    ('block', 'hash'),
+    ('transaction', 'hash'),
+    ('stark_contract', 'address'),
+    ('token_contract', 'address'),
+    ('account', 'address'),
+    ('account', 'stark_key'),
+    ('token', 'token_id'),
+]
+
+
+async def report(count: int):
+    from fluence.services import async_session
+
+    async with async_session() as session:
+        for table in dict.fromkeys(table for table, _column in COLUMNS):
+            # Partitioned parents hold no data themselves, so sizes are summed over the partitions.
+            table_size, indexes_size = (await session.execute(text(
+                f"SELECT CAST(sum(pg_table_size(relid)) AS bigint), CAST(sum(pg_indexes_size(relid)) AS bigint) "
+                f"FROM pg_partition_tree('\"{table}\"')"))).one()
+            print(f'{table}: table {table_size >> 10} KiB, indexes {indexes_size >> 10} KiB')
+
+        for table, column in COLUMNS:
+            values = (await session.execute(text(
+                f'SELECT {column} FROM "{table}" WHERE {column} IS NOT NULL '
+                f'ORDER BY random() LIMIT :count'), {'count': count})).scalars().all()
+            if not values:
+                continue
+
+            width = (await session.execute(text(
+                f'SELECT avg(pg_column_size({column})) FROM "{table}"'))).scalar_one()
+            started = time.perf_counter()
+            for value in values:
+                await session.execute(text(f'SELECT id FROM "{table}" WHERE {column} = :value'), {'value': value})
+            elapsed = time.perf_counter() - started
+            print(f'{table}.{column}: {float(width):.1f} bytes, {elapsed / len(values) * 1e6:.0f} us per lookup')
+
+
+@click.command()
+@click.option('-n', '--count', default=1000)
+def bench(count: int):
+    asyncio.run(report(count))
+
+
+if __name__ == '__main__':
+    bench()
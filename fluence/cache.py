@@ -0,0 +1,67 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Hashable, Any, Callable, Awaitable
+
+
+class LRUCache:
+    def __init__(self, maxsize: int, ttl: Optional[float] = None, weigh: Callable[[Any], int] = lambda _: 1):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._weigh = weigh
+        self._weight = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: Hashable, default=None):
+        try:
+            expire_at, value = self._entries[key]
+        except KeyError:
+            return default
+
+        if expire_at is not None and expire_at < time.monotonic():
+            self.pop(key)
+            return default
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self.pop(key)
+        expire_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        self._entries[key] = expire_at, value
+        self._weight += self._weigh(value)
+        while self._weight > self._maxsize:
+            _key, (_expire_at, evicted) = self._entries.popitem(last=False)
+            self._weight -= self._weigh(evicted)
+
+    def pop(self, key: Hashable):
+        try:
+            _expire_at, value = self._entries.pop(key)
+        except KeyError:
+            return
+
+        self._weight -= self._weigh(value)
+
+    def clear(self):
+        self._entries.clear()
+        self._weight = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        future = self._calls.get(key)
+        if future is None:
+            future = self._calls[key] = asyncio.ensure_future(fn())
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # A cancelled caller must not cancel the call others are waiting on.
+        return await asyncio.shield(future)
@@ -11,6 +11,7 @@ from starkware.starknet.services.api.gateway.transaction import InvokeFunction
 from web3 import Web3
 
 from fluence import utils
+from fluence.cache import LRUCache, SingleFlight
 from fluence.models import State
 from fluence.utils import parse_int
 
@@ -59,10 +60,23 @@ class EtherFluence:
 
 
 class StarkFluence:
-    def __init__(self, stark_address: int, feeder: FeederGatewayClient, gateway: GatewayClient):
+    def __init__(
+            self,
+            stark_address: int,
+            feeder: FeederGatewayClient,
+            gateway: GatewayClient,
+            cache_size: int = 4096,
+            cache_ttl: float = 5):
         self._address = stark_address
         self._feeder = feeder
         self._gateway = gateway
+        self._cache = LRUCache(cache_size, cache_ttl)
+        self._generation = 0
+        self._calls = SingleFlight()
+
+    def invalidate(self):
+        self._cache.clear()
+        self._generation += 1
 
     async def get_client(self, address):
         stark_key, = await self._estimate('get_client', [address])
@@ -105,10 +119,21 @@ class StarkFluence:
     def fulfill_order(self, order_id, user, nonce, signature):
         return self._transact('fulfill_order', [order_id, user, nonce], signature)
 
-    async def _estimate(self, name: str, calldata: list):
+    async def _estimate(self, name: str, calldata: list) -> list[int]:
+        key = name, tuple(map(parse_int, calldata))
+        result = self._cache.get(key)
+        if result is None:
+            generation = self._generation
+            result = await self._calls.do(key, lambda: self._call(name, calldata))
+            if generation == self._generation:
+                self._cache.put(key, result)
+
+        return result
+
+    async def _call(self, name: str, calldata: list) -> list[int]:
         response = await self._feeder.call_contract(self._invoke(name, calldata))
 
-        return map(parse_int, response['result'])
+        return list(map(parse_int, response['result']))
 
     async def _transact(self, name: str, calldata: list, signature):
         response = await self._gateway.add_transaction(self._invoke(name, calldata, list(map(parse_int, signature))))
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import click
 from services.external_api.base_client import BadRequest
@@ -9,7 +9,9 @@ from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import sessionmaker
 from starkware.starknet.services.api.feeder_gateway.feeder_gateway_client import FeederGatewayClient
 
-from fluence.models import Block, Transaction, StarkContract
+from fluence.models import Block, BlockArchive, Transaction, StarkContract
+from fluence.models.Block import STATUS_FINAL
+from fluence.partitions import PartitionKeeper
 
 
 class BlockCache:
@@ -39,6 +41,7 @@ class Crawler:
         self._feeder = feeder
         self._async_session = async_session
         self._block_cache = BlockCache(async_session)
+        self._partitions = PartitionKeeper(async_session)
         self._cooldown = cooldown
 
     async def run(self, thru):
@@ -75,7 +78,7 @@ class Crawler:
             async with self._async_session() as session:
                 async for block in (await session.stream(
                         select(Block).
-                        where(~Block._document['status'].astext.in_(['ACCEPTED_ON_L1', 'ACCEPTED_ONCHAIN'])).
+                        where(Block.status.not_in(STATUS_FINAL)).
                         where(Block.id > block_number).
                         order_by(Block.id).
                         limit(20))).scalars():
@@ -95,13 +98,37 @@ class Crawler:
                     if dry:
                         continue
 
-                    block._document = document
                     if document['block_hash'] != block.hash or document['status'] in ['ABORTED']:
                         await session.execute(delete(Transaction).where(Transaction.block == block))
-                        session.delete(block)
+                        await session.execute(delete(BlockArchive).where(BlockArchive.block_id == block.id))
+                        await session.execute(delete(Block).where(Block.id == block.id))
+                        continue
+
+                    block.status = document['status']
+                    await session.merge(BlockArchive(block_id=block.id, document=document))
 
                 await session.commit()
 
+    async def retain(self, days: int, batch: int = 1000):
+        """Drops the archived documents of finalized blocks older than `days`."""
+        deadline = datetime.now(timezone.utc) - timedelta(days=days)
+        while True:
+            async with self._async_session() as session:
+                expired = select(BlockArchive.block_id). \
+                    join(Block, Block.id == BlockArchive.block_id). \
+                    where(Block.status.in_(STATUS_FINAL)). \
+                    where(Block.timestamp < deadline). \
+                    limit(batch)
+                result = await session.execute(
+                    delete(BlockArchive).
+                    where(BlockArchive.block_id.in_(expired)).
+                    execution_options(synchronize_session=False))
+                await session.commit()
+
+            logging.warning(f'retain(deleted={result.rowcount})')
+            if result.rowcount < batch:
+                break
+
     async def _crawl(self, block_number: int):
         if await self._block_cache.hit(block_number):
             return
@@ -110,12 +137,14 @@ class Crawler:
         await self._persist(await self._feeder.get_block(block_number=block_number))
 
     async def _persist(self, document):
+        await self._partitions.ensure(document['block_number'])
         async with self._async_session() as session:
             block = Block(
                 id=document['block_number'],
                 hash=document['block_hash'],
                 timestamp=datetime.fromtimestamp(document['timestamp'], timezone.utc),
-                _document=document)
+                status=document['status'],
+                archive=BlockArchive(document=document))
             session.add(block)
 
             for receipt, transaction in zip(document['transaction_receipts'], document['transactions']):
@@ -160,3 +189,12 @@ def purge(dry):
 
     crawler = Crawler(feeder_client, async_session, 15)
     asyncio.run(crawler.purge(dry))
+
+
+@crawl.command()
+@click.option('--days', default=30, type=int)
+def retain(days):
+    from fluence.services import async_session, feeder_client
+
+    crawler = Crawler(feeder_client, async_session, 15)
+    asyncio.run(crawler.retain(days))
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import select, true
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import functions
+
+from fluence.models import Event
+
+Predicate = Callable[[dict], bool]
+
+
+class EventBus:
+    """Tails the event table written by the interpreter and fans events out to subscribers."""
+
+    def __init__(self, async_session: sessionmaker, interval: float, batch: int, backlog: int):
+        self.cursor: Optional[int] = None
+        self._async_session = async_session
+        self._interval = interval
+        self._batch = batch
+        self._backlog = backlog
+        self._subscribers: dict[asyncio.Queue, Predicate] = {}
+
+    def subscribe(self, predicate: Predicate) -> asyncio.Queue:
+        """Returns a queue of matching events, closed with `None` if the subscriber falls too far behind."""
+        queue = asyncio.Queue(self._backlog)
+        self._subscribers[queue] = predicate
+
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    async def replay(self, after: int, predicate: Predicate, limit: int) -> list[dict]:
+        events = []
+        async with self._async_session() as session:
+            while len(events) < limit and (self.cursor is None or after < self.cursor):
+                batch = (await session.execute(
+                    select(Event).
+                    where(Event.id > after).
+                    where(Event.id <= self.cursor if self.cursor is not None else true()).
+                    order_by(Event.id).
+                    limit(self._batch))).scalars().all()
+                if not batch:
+                    break
+
+                events += filter(predicate, map(Event.dump, batch))
+                after = batch[-1].id
+
+        return events[:limit]
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logging.exception(e)
+
+            await asyncio.sleep(self._interval)
+
+    async def poll(self):
+        async with self._async_session() as session:
+            if self.cursor is None:
+                self.cursor = (await session.execute(select(functions.max(Event.id)))).scalar_one() or 0
+                return
+
+            while True:
+                batch = (await session.execute(
+                    select(Event).
+                    where(Event.id > self.cursor).
+                    order_by(Event.id).
+                    limit(self._batch))).scalars().all()
+                for event in map(Event.dump, batch):
+                    self._publish(event)
+                    self.cursor = event['id']
+
+                if len(batch) < self._batch:
+                    break
+
+    def _publish(self, event: dict):
+        for queue, predicate in list(self._subscribers.items()):
+            if not predicate(event):
+                continue
+
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Drop the laggard, which may resume from its last event id.
+                self.unsubscribe(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
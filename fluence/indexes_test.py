@@ -0,0 +1,64 @@
+"""Query-plan regression test for the secondary indexes.
+
+Migrates a scratch schema of the database at `DATABASE_URL` to head, the way deployments get their
+schema, and asserts the hot lookups are planned on their index. Sequential scans are disabled, so
+the plans do not hinge on seeded statistics: a lookup without a usable index still falls back to
+one. Skipped without a database.
+"""
+from pathlib import Path
+
+import pytest
+from decouple import config
+from sqlalchemy import create_engine, text
+
+DATABASE_URL = config('DATABASE_URL', default='')
+SCHEMA = 'indexes_test'
+ROOT = Path(__file__).resolve().parents[1]
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason='DATABASE_URL is not set')
+
+# Untyped literals, so that the lookups read the same whichever type the columns are migrated to.
+PLANS = [
+    ("SELECT id FROM account WHERE stark_key = '42'", 'ix_account_stark_key'),
+    ('SELECT id FROM blueprint WHERE minter_id = 42', 'ix_blueprint_minter_id'),
+    ('SELECT id FROM token WHERE owner_id = 42', 'ix_token_owner_id'),
+    ("SELECT id FROM token WHERE contract_id = 42 AND token_id = '42'", 'ix_token_contract_id_token_id'),
+    ('SELECT id FROM limit_order WHERE user_id = 42', 'ix_limit_order_user_id'),
+    ('SELECT id FROM limit_order WHERE token_id = 42', 'ix_limit_order_token_id'),
+    # Should the table be partitioned, its partitions name their copy of the index after themselves.
+    ('SELECT id FROM transaction WHERE contract_id = 42 AND block_number > 990', 'contract_id_block_number'),
+]
+
+
+@pytest.fixture(scope='module')
+def connection():
+    from alembic import command
+    from alembic.config import Config
+
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+            connection.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+            connection.execute(text(f'SET search_path TO {SCHEMA}, public'))
+
+        alembic_config = Config(str(ROOT / 'alembic.ini'))
+        alembic_config.set_main_option('script_location', str(ROOT / 'alembic'))
+        alembic_config.attributes['connection'] = connection
+        command.upgrade(alembic_config, 'head')
+
+        with connection.begin():
+            connection.execute(text('SET enable_seqscan TO off'))
+
+        yield connection
+
+        with connection.begin():
+            connection.execute(text(f'DROP SCHEMA {SCHEMA} CASCADE'))
+    engine.dispose()
+
+
+@pytest.mark.parametrize('query, index', PLANS)
+def test_plan_uses_index(connection, query, index):
+    plan = '\n'.join(connection.execute(text(f'EXPLAIN {query}')).scalars())
+
+    assert index in plan, plan
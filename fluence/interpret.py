@@ -7,7 +7,7 @@ from urllib.parse import urljoin
 import aiohttp
 import click
 from jsonschema.exceptions import ValidationError
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -15,7 +15,10 @@ from web3 import Web3
 from web3.exceptions import BadFunctionCallOutput
 
 from fluence.contracts import ERC20, ERC721Metadata
-from fluence.models import Account, TokenContract, Token, LimitOrder, Block, StarkContract, Blueprint
+from fluence.models import Account, TokenContract, Token, LimitOrder, Block, StarkContract, Blueprint, Balance, Event, \
+    Ledger, OrderBook, CollectionStats
+from fluence.models.Event import KIND_MINT, KIND_DEPOSIT, KIND_WITHDRAW, KIND_TRANSFER, \
+    KIND_ORDER_CREATED, KIND_ORDER_FULFILLED, KIND_ORDER_CANCELLED
 from fluence.models.LimitOrder import Side
 from fluence.models.TokenContract import KIND_ERC721
 from fluence.models.Transaction import Transaction, TYPE_DEPLOY
@@ -59,8 +62,10 @@ class FluenceInterpreter:
             token_contract = (await self.session.execute(
                 select(TokenContract).
                 where(TokenContract.address == address).
-                options(selectinload(TokenContract.blueprint).
-                        selectinload(Blueprint.minter)))).scalar_one()
+                options(
+                    selectinload(TokenContract.stats),
+                    selectinload(TokenContract.blueprint).
+                    selectinload(Blueprint.minter)))).scalar_one()
             assert token_contract.fungible == (int(kind) != KIND_ERC721)
             assert token_contract.blueprint.minter.stark_key == Decimal(mint)
         except NoResultFound:
@@ -72,6 +77,8 @@ class FluenceInterpreter:
                 fungible=int(kind) != KIND_ERC721,
                 blueprint=blueprint)
             self.session.add(self.lift_contract(token_contract))
+        if not token_contract.fungible:
+            self.lift_stats(token_contract)
 
     async def register_client(self, tx: Transaction):
         logging.warning(f'register_client')
@@ -84,15 +91,21 @@ class FluenceInterpreter:
         token = await self.lift_token(token_id, contract)
         token.latest_tx = tx
 
-        token.owner = await self.lift_account(user)
+        await self.hand_over(token, await self.lift_account(user))
+        await self.record(KIND_MINT, tx, contract, token, token_id, to=token.owner)
+        self.emit(KIND_MINT, tx, contract, token_id, to=user)
 
     async def withdraw(self, tx: Transaction):
         logging.warning(f'withdraw')
-        _user, amount_or_id, contract, _address, _nonce = tx.calldata
+        user, amount_or_id, contract, _address, _nonce = tx.calldata
         token = await self.lift_token(amount_or_id, contract)
         if token:
-            token.owner = None
+            await self.hand_over(token, None)
             token.latest_tx = tx
+        else:
+            await self.credit(user, contract, -Decimal(amount_or_id))
+        await self.record(KIND_WITHDRAW, tx, contract, token, amount_or_id, from_=await self.lift_account(user))
+        self.emit(KIND_WITHDRAW, tx, contract, amount_or_id, from_=user)
 
     async def deposit(self, tx: Transaction):
         logging.warning(f'deposit')
@@ -100,8 +113,12 @@ class FluenceInterpreter:
         account = await self.lift_account(user)
         token = await self.lift_token(amount_or_id, contract)
         if token:
-            token.owner = account
+            await self.hand_over(token, account)
             token.latest_tx = tx
+        else:
+            await self.credit(user, contract, Decimal(amount_or_id))
+        await self.record(KIND_DEPOSIT, tx, contract, token, amount_or_id, to=account)
+        self.emit(KIND_DEPOSIT, tx, contract, amount_or_id, to=user)
 
     async def transfer(self, tx: Transaction):
         logging.warning(f'transfer')
@@ -112,8 +129,13 @@ class FluenceInterpreter:
         if token:
             assert token.owner == from_account
 
-            token.owner = to_account
+            await self.hand_over(token, to_account)
             token.latest_tx = tx
+        else:
+            await self.credit(from_address, contract, -Decimal(amount_or_token_id))
+            await self.credit(to_address, contract, Decimal(amount_or_token_id))
+        await self.record(KIND_TRANSFER, tx, contract, token, amount_or_token_id, from_=from_account, to=to_account)
+        self.emit(KIND_TRANSFER, tx, contract, amount_or_token_id, from_=from_address, to=to_address)
 
     async def create_order(self, tx: Transaction):
         logging.warning(f'create_order')
@@ -128,29 +150,58 @@ class FluenceInterpreter:
             user=account,
             bid=parse_int(bid) == Side.BID,
             token=token,
+            base_contract=token.contract,
             quote_contract=quote_contract,
             quote_amount=Decimal(quote_amount),
             tx=tx)
         self.session.add(limit_order)
+        await self.book(token.contract.id, quote_contract.id, limit_order.bid, limit_order.quote_amount, opened=True)
+        if limit_order.bid:
+            await self.credit(user, quote_contract.address, -limit_order.quote_amount)
 
         token.ask = limit_order
+        self.emit_order(KIND_ORDER_CREATED, tx, limit_order)
 
     async def fulfill_order(self, tx: Transaction):
         logging.warning(f'fulfill_order')
         order_id, user, _nonce = tx.calldata
         limit_order, = (await self.session.execute(
-            select(LimitOrder).where(LimitOrder.order_id == Decimal(order_id)))).one()
+            select(LimitOrder).
+            where(LimitOrder.order_id == Decimal(order_id)).
+            options(
+                selectinload(LimitOrder.user),
+                selectinload(LimitOrder.token).selectinload(Token.contract).selectinload(TokenContract.stats),
+                selectinload(LimitOrder.token).selectinload(Token.owner),
+                selectinload(LimitOrder.quote_contract)))).one()
         limit_order.closed_tx = tx
         limit_order.fulfilled = True
+        await self.book(
+            limit_order.base_contract_id, limit_order.quote_contract_id, limit_order.bid, limit_order.quote_amount,
+            opened=False)
 
         token = limit_order.token
         token.latest_tx = tx
         token.ask = None
+        quote_contract = limit_order.quote_contract.address
+        taker = await self.lift_account(user)
         if limit_order.bid:
-            token.owner = limit_order.user
+            await self.hand_over(token, limit_order.user)
+            await self.credit(user, quote_contract, limit_order.quote_amount)
+            seller, buyer = taker, limit_order.user
         else:
-            user = await self.lift_account(user)
-            token.owner = user
+            await self.credit(user, quote_contract, -limit_order.quote_amount)
+            await self.credit(limit_order.user.stark_key, quote_contract, limit_order.quote_amount)
+            await self.hand_over(token, taker)
+            seller, buyer = limit_order.user, taker
+
+        stats = self.lift_stats(token.contract)
+        stats.sale_count += 1
+        if quote_contract == ZERO_ADDRESS:
+            stats.volume += limit_order.quote_amount
+            stats.last_sale_price = limit_order.quote_amount
+        await self.record(
+            KIND_ORDER_FULFILLED, tx, token.contract.address, token, token.token_id, from_=seller, to=buyer)
+        self.emit_order(KIND_ORDER_FULFILLED, tx, limit_order, taker=user)
 
     async def cancel_order(self, tx: Transaction):
         logging.warning(f'cancel_order')
@@ -158,10 +209,98 @@ class FluenceInterpreter:
         limit_order, = (await self.session.execute(
             select(LimitOrder).
             where(LimitOrder.order_id == Decimal(order_id)).
-            options(selectinload(LimitOrder.token)))).one()
+            options(
+                selectinload(LimitOrder.token).selectinload(Token.contract),
+                selectinload(LimitOrder.user),
+                selectinload(LimitOrder.quote_contract)))).one()
         limit_order.closed_tx = tx
         limit_order.fulfilled = False
+        await self.book(
+            limit_order.base_contract_id, limit_order.quote_contract_id, limit_order.bid, limit_order.quote_amount,
+            opened=False)
         limit_order.token.ask = None
+        if limit_order.bid:
+            await self.credit(
+                limit_order.user.stark_key, limit_order.quote_contract.address, limit_order.quote_amount)
+        self.emit_order(KIND_ORDER_CANCELLED, tx, limit_order)
+
+    async def book(self, base_contract_id: int, quote_contract_id: int, bid: bool, price: Decimal, opened: bool):
+        try:
+            order_book, = (await self.session.execute(
+                select(OrderBook).
+                where(OrderBook.base_contract_id == base_contract_id).
+                where(OrderBook.quote_contract_id == quote_contract_id).
+                where(OrderBook.bid == bid))).one()
+        except NoResultFound:
+            order_book = OrderBook(
+                base_contract_id=base_contract_id, quote_contract_id=quote_contract_id, bid=bid, open_count=0)
+            self.session.add(order_book)
+
+        if opened:
+            order_book.open_count += 1
+            best_price = order_book.best_price
+            if best_price is None or (price > best_price if bid else price < best_price):
+                order_book.best_price = price
+        else:
+            order_book.open_count -= 1
+            if order_book.open_count < 0:
+                logging.error(f'book(base={base_contract_id}, quote={quote_contract_id}, bid={bid}, open_count=-1)')
+                order_book.open_count = 0
+            if price == order_book.best_price:
+                # The closed order is flushed before this runs, so the partial index only holds the rest.
+                best = func.max(LimitOrder.quote_amount) if bid else func.min(LimitOrder.quote_amount)
+                order_book.best_price = (await self.session.execute(
+                    select(best).
+                    where(LimitOrder.base_contract_id == base_contract_id).
+                    where(LimitOrder.quote_contract_id == quote_contract_id).
+                    where(LimitOrder.bid == bid).
+                    where(LimitOrder.fulfilled.is_(None)))).scalar_one()
+
+        return order_book
+
+    async def record(self, kind: str, tx: Transaction, contract: str, token: Optional[Token], amount_or_token_id,
+                     from_: Optional[Account] = None, to: Optional[Account] = None):
+        if token is not None:
+            token_contract, amount = token.contract, None
+        else:
+            token_contract, = (await self.session.execute(
+                select(TokenContract).where(TokenContract.address == to_checksum_address(contract)))).one()
+            amount = Decimal(amount_or_token_id)
+
+        self.session.add(Ledger(
+            kind=kind,
+            contract=token_contract,
+            token=token,
+            amount=amount,
+            from_=from_,
+            to=to,
+            tx=tx))
+
+    def emit(self, kind: str, tx: Transaction, contract: str, amount_or_token_id,
+             from_: Optional[str] = None, to: Optional[str] = None, **payload):
+        accounts = [str(Decimal(a)) for a in [from_, to] if a is not None]
+        self.session.add(Event(kind=kind, tx=tx, payload={
+            'block_number': tx.block_number,
+            'transaction_hash': tx.hash,
+            'contract': to_checksum_address(contract),
+            'amount_or_token_id': str(Decimal(amount_or_token_id)),
+            'accounts': accounts,
+            **({'from': accounts[0]} if from_ is not None else {}),
+            **({'to': accounts[-1]} if to is not None else {}),
+            **payload,
+        }))
+
+    def emit_order(self, kind: str, tx: Transaction, limit_order: LimitOrder, taker: Optional[str] = None):
+        self.emit(
+            kind, tx,
+            limit_order.token.contract.address,
+            limit_order.token.token_id,
+            from_=limit_order.user.stark_key,
+            to=taker,
+            order_id=str(limit_order.order_id),
+            bid=limit_order.bid,
+            quote_contract=limit_order.quote_contract.address,
+            quote_amount=str(limit_order.quote_amount))
 
     async def lift_account(self, user: str, address: Optional[str] = None) -> Account:
         user = Decimal(user)
@@ -184,7 +323,9 @@ class FluenceInterpreter:
         contract = to_checksum_address(contract)
 
         token_contract, = (await self.session.execute(
-            select(TokenContract).where(TokenContract.address == contract))).one()
+            select(TokenContract).
+            where(TokenContract.address == contract).
+            options(selectinload(TokenContract.stats)))).one()
         if token_contract.fungible:
             return None
 
@@ -192,7 +333,10 @@ class FluenceInterpreter:
             token, = (await self.session.execute(
                 select(Token).
                 where(Token.token_id == token_id).
-                where(Token.contract == token_contract))).one()
+                where(Token.contract == token_contract).
+                options(
+                    selectinload(Token.owner),
+                    selectinload(Token.token_metadata)))).one()
         except NoResultFound:
             token = Token(contract=token_contract, token_id=token_id, nonce=0)
             self.session.add(token)
@@ -200,15 +344,68 @@ class FluenceInterpreter:
         token.token_uri = urljoin(token_contract.base_uri, str(token_id)) if token_contract.base_uri else \
             ERC721Metadata(token_contract.address, self.w3).token_uri(int(token_id))
         async with self.client.get(token.token_uri) as resp:
-            token.asset_metadata = await resp.json()
+            document = await resp.json()
 
-            ERC721Metadata.validate(token.asset_metadata)
-            token.name = token.asset_metadata['name']
-            token.description = token.asset_metadata['description']
-            token.image = token.asset_metadata['image']
+            ERC721Metadata.validate(document)
+            token.set_metadata(document)
+            token.name = document['name']
+            token.description = document['description']
+            token.image = document['image']
 
         return token
 
+    async def credit(self, user, contract: str, amount: Decimal) -> Balance:
+        account = await self.lift_account(user)
+        contract = to_checksum_address(contract)
+
+        try:
+            balance, = (await self.session.execute(
+                select(Balance).
+                join(Balance.contract).
+                where(Balance.account == account).
+                where(TokenContract.address == contract))).one()
+        except NoResultFound:
+            token_contract, = (await self.session.execute(
+                select(TokenContract).where(TokenContract.address == contract))).one()
+            balance = Balance(account=account, contract=token_contract, amount=0)
+            self.session.add(balance)
+
+        balance.amount += amount
+        if balance.amount < 0:
+            # The books are short, e.g. of a deposit made before balances were indexed. Asserting would stop
+            # the interpreter at this block for good, so the mismatch is logged and the balance clamped.
+            logging.error(f'credit(user={user}, contract={contract}, amount={amount}, balance={balance.amount})')
+            balance.amount = 0
+
+        return balance
+
+    async def hand_over(self, token: Token, owner: Optional[Account]):
+        """Sets the owner of `token`, counting the items held on L2 and the accounts holding its collection."""
+        previous, token.owner = token.owner, owner
+        if previous is owner:
+            return
+
+        stats = self.lift_stats(token.contract)
+        if (previous is None) != (owner is None):
+            stats.item_count += 1 if owner is not None else -1
+        for account, delta in [(previous, -1), (owner, 1)]:
+            if account is None:
+                continue
+
+            held = (await self.session.execute(
+                select(Token.id).
+                where(Token.contract == token.contract).
+                where(Token.owner == account).
+                limit(2))).all()
+            if len(held) == (1 if delta > 0 else 0):
+                stats.owner_count += delta
+
+    def lift_stats(self, token_contract: TokenContract) -> CollectionStats:
+        if token_contract.stats is None:
+            token_contract.stats = CollectionStats(item_count=0, owner_count=0, sale_count=0, volume=0)
+
+        return token_contract.stats
+
     def lift_contract(self, token_contract: TokenContract) -> TokenContract:
         if token_contract.address == ZERO_ADDRESS:
             token_contract.name, token_contract.symbol, token_contract.decimals = 'Ether', 'ETH', 18
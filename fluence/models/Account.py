@@ -1,20 +1,22 @@
 from marshmallow import Schema, fields
-from sqlalchemy import Column, Integer, Numeric, String
+from sqlalchemy import Column, Integer
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from web3 import Web3
 
 from .Base import Base
+from .types import Address, Felt
 
 
 class Account(Base):
     __tablename__ = 'account'
 
     id = Column(Integer, primary_key=True)
-    stark_key = Column(Numeric(precision=80), nullable=False)
-    _address = Column('address', String, unique=True)
+    stark_key = Column(Felt, nullable=False, index=True)
+    _address = Column('address', Address, unique=True)
 
     tokens = relationship('Token', back_populates='owner')
+    balances = relationship('Balance', back_populates='account')
 
     @hybrid_property
     def address(self):
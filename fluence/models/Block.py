@@ -1,15 +1,24 @@
-from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from .Base import Base
+from .types import Hash
+
+STATUS_FINAL = ['ACCEPTED_ON_L1', 'ACCEPTED_ONCHAIN']
 
 
 class Block(Base):
     __tablename__ = 'block'
+    __table_args__ = (
+        Index('ix_block_id_pending', 'id',
+              postgresql_where=text(f"status NOT IN ({', '.join(map(repr, STATUS_FINAL))})")),
+        # Partitions are created by the crawler, see fluence.partitions.
+        {'postgresql_partition_by': 'RANGE (id)'},
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=False)
-    hash = Column(String, unique=True, nullable=False)
+    hash = Column(Hash, nullable=False, index=True)
     timestamp = Column(DateTime(timezone=True), nullable=False)
-    _document = Column(JSON, nullable=False)
+    status = Column(String, nullable=False)
 
     transactions = relationship('Transaction', back_populates='block')
+    archive = relationship('BlockArchive', uselist=False, cascade='all, delete-orphan')
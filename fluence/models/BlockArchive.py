@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey
+
+from .Base import Base
+from .types import CompressedJSON
+
+
+class BlockArchive(Base):
+    """The feeder document of a block, kept apart from the block so scans over blocks stay narrow."""
+
+    __tablename__ = 'block_archive'
+
+    block_id = Column(Integer, ForeignKey('block.id'), primary_key=True)
+    document = Column(CompressedJSON, nullable=False)
@@ -11,7 +11,7 @@ class Blueprint(Base):
 
     id = Column(Integer, primary_key=True)
     permanent_id = Column(String, unique=True)
-    minter_id = Column(Integer, ForeignKey('account.id'), nullable=False)
+    minter_id = Column(Integer, ForeignKey('account.id'), nullable=False, index=True)
     expire_at = Column(DateTime(timezone=True))
 
     minter = relationship('Account')
@@ -0,0 +1,35 @@
+from marshmallow import Schema, fields
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from .Base import Base
+
+SORTS = ['item_count', 'owner_count', 'sale_count', 'volume']
+
+
+class CollectionStats(Base):
+    """Figures of a non-fungible collection, kept up to date by the interpreter.
+
+    `item_count` counts the tokens held on L2, not the ones only described by uploaded metadata or
+    withdrawn. `volume` and `last_sale_price` only account for sales quoted in Ether.
+    """
+
+    __tablename__ = 'collection_stats'
+    __table_args__ = tuple(Index(f'ix_collection_stats_{sort}', sort, 'contract_id') for sort in SORTS)
+
+    contract_id = Column(Integer, ForeignKey('token_contract.id'), primary_key=True)
+    item_count = Column(Integer, nullable=False)
+    owner_count = Column(Integer, nullable=False)
+    sale_count = Column(Integer, nullable=False)
+    volume = Column(Numeric(precision=80), nullable=False)
+    last_sale_price = Column(Numeric(precision=80))
+
+    contract = relationship('TokenContract', back_populates='stats')
+
+
+class CollectionStatsSchema(Schema):
+    item_count = fields.Integer()
+    owner_count = fields.Integer()
+    sale_count = fields.Integer()
+    volume = fields.String()
+    last_sale_price = fields.String()
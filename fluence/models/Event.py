@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, JSON, ForeignKeyConstraint
+from sqlalchemy.orm import relationship
+
+from .Base import Base
+
+KIND_MINT = 'mint'
+KIND_DEPOSIT = 'deposit'
+KIND_WITHDRAW = 'withdraw'
+KIND_TRANSFER = 'transfer'
+KIND_ORDER_CREATED = 'order_created'
+KIND_ORDER_FULFILLED = 'order_fulfilled'
+KIND_ORDER_CANCELLED = 'order_cancelled'
+
+
+class Event(Base):
+    __tablename__ = 'event'
+    __table_args__ = (
+        ForeignKeyConstraint(['tx_id', 'block_number'], ['transaction.id', 'transaction.block_number']),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    tx_id = Column(Integer, nullable=False)
+    block_number = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    tx = relationship('Transaction')
+
+    def dump(self) -> dict:
+        return {'id': self.id, 'kind': self.kind, **self.payload}
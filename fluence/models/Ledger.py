@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Numeric, String, ForeignKey, ForeignKeyConstraint, Index
+from sqlalchemy.orm import relationship
+
+from .Base import Base
+
+
+class Ledger(Base):
+    """One movement of a token or of a fungible amount between accounts, appended by the interpreter."""
+
+    __tablename__ = 'ledger'
+    __table_args__ = (
+        Index('ix_ledger_token_id_id', 'token_id', 'id'),
+        Index('ix_ledger_from_id_id', 'from_id', 'id'),
+        Index('ix_ledger_to_id_id', 'to_id', 'id'),
+        ForeignKeyConstraint(['tx_id', 'block_number'], ['transaction.id', 'transaction.block_number']),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    contract_id = Column(Integer, ForeignKey('token_contract.id'), nullable=False)
+    token_id = Column(Integer, ForeignKey('token.id'))
+    amount = Column(Numeric(precision=80))
+    from_id = Column(Integer, ForeignKey('account.id'))
+    to_id = Column(Integer, ForeignKey('account.id'))
+    tx_id = Column(Integer, nullable=False)
+    block_number = Column(Integer, nullable=False)
+
+    contract = relationship('TokenContract')
+    token = relationship('Token')
+    from_ = relationship('Account', foreign_keys=from_id)
+    to = relationship('Account', foreign_keys=to_id)
+    tx = relationship('Transaction')
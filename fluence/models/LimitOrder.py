@@ -1,7 +1,7 @@
 from enum import IntEnum
 
 from marshmallow import Schema, fields
-from sqlalchemy import Column, Integer, Numeric, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, Boolean, ForeignKey, ForeignKeyConstraint, Index, null
 from sqlalchemy.orm import relationship
 
 from .Account import AccountSchema
@@ -23,23 +23,34 @@ class State(IntEnum):
 
 class LimitOrder(Base):
     __tablename__ = 'limit_order'
+    __table_args__ = (
+        Index('ix_limit_order_book', 'base_contract_id', 'quote_contract_id', 'bid', 'quote_amount', 'id',
+              postgresql_where=Column('fulfilled') == null()),
+        ForeignKeyConstraint(['tx_id', 'tx_block_number'], ['transaction.id', 'transaction.block_number']),
+        ForeignKeyConstraint(
+            ['closed_tx_id', 'closed_tx_block_number'], ['transaction.id', 'transaction.block_number']),
+    )
 
     id = Column(Integer, primary_key=True)
     order_id = Column(Numeric(precision=80), unique=True, nullable=False)
-    user_id = Column(Integer, ForeignKey('account.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('account.id'), nullable=False, index=True)
     bid = Column(Boolean, nullable=False)
-    token_id = Column(Integer, ForeignKey('token.id'), nullable=False)
+    token_id = Column(Integer, ForeignKey('token.id'), nullable=False, index=True)
+    base_contract_id = Column(Integer, ForeignKey('token_contract.id'), nullable=False)
     quote_contract_id = Column(Integer, ForeignKey('token_contract.id'), nullable=False)
     quote_amount = Column(Numeric(precision=80), nullable=False)
-    tx_id = Column(Integer, ForeignKey('transaction.id'), nullable=False)
-    closed_tx_id = Column(Integer, ForeignKey('transaction.id'))
+    tx_id = Column(Integer, nullable=False)
+    tx_block_number = Column(Integer, nullable=False)
+    closed_tx_id = Column(Integer)
+    closed_tx_block_number = Column(Integer)
     fulfilled = Column(Boolean)
 
     user = relationship('Account')
     token = relationship('Token', foreign_keys=token_id)
+    base_contract = relationship('TokenContract', foreign_keys=base_contract_id)
     quote_contract = relationship('TokenContract', foreign_keys=quote_contract_id)
-    tx = relationship('Transaction', foreign_keys=tx_id)
-    closed_tx = relationship('Transaction', foreign_keys=closed_tx_id)
+    tx = relationship('Transaction', foreign_keys=[tx_id, tx_block_number])
+    closed_tx = relationship('Transaction', foreign_keys=[closed_tx_id, closed_tx_block_number])
 
     @property
     def state(self):
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Numeric, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from .Base import Base
+
+
+class OrderBook(Base):
+    """Open orders of one side of a market, kept up to date by the interpreter."""
+
+    __tablename__ = 'order_book'
+    __table_args__ = (
+        UniqueConstraint('base_contract_id', 'quote_contract_id', 'bid'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    base_contract_id = Column(Integer, ForeignKey('token_contract.id'), nullable=False)
+    quote_contract_id = Column(Integer, ForeignKey('token_contract.id'), nullable=False)
+    bid = Column(Boolean, nullable=False)
+    open_count = Column(Integer, nullable=False)
+    best_price = Column(Numeric(precision=80))
+
+    base_contract = relationship('TokenContract', foreign_keys=base_contract_id)
+    quote_contract = relationship('TokenContract', foreign_keys=quote_contract_id)
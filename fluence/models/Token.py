@@ -1,31 +1,55 @@
 from marshmallow import Schema, fields
-from sqlalchemy import Column, Integer, Numeric, String, JSON, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, ForeignKeyConstraint, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 
+from fluence.thumbnail import thumbnail_urls
 from .Base import Base
-from .TokenContract import TokenContractSchema
+from .TokenContract import TokenContractSchema, SEARCH_CONFIG
+from .types import Felt
 
 
 class Token(Base):
     __tablename__ = 'token'
+    __table_args__ = (
+        Index('ix_token_contract_id_token_id', 'contract_id', 'token_id'),
+        Index('ix_token_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_token_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        ForeignKeyConstraint(
+            ['latest_tx_id', 'latest_tx_block_number'], ['transaction.id', 'transaction.block_number']),
+    )
 
     id = Column(Integer, primary_key=True)
     contract_id = Column(Integer, ForeignKey('token_contract.id'), nullable=False)
-    token_id = Column(Numeric(precision=80), nullable=False)
-    owner_id = Column(Integer, ForeignKey('account.id'))
-    latest_tx_id = Column(Integer, ForeignKey('transaction.id'))
+    token_id = Column(Felt, nullable=False)
+    owner_id = Column(Integer, ForeignKey('account.id'), index=True)
+    latest_tx_id = Column(Integer)
+    latest_tx_block_number = Column(Integer)
     ask_id = Column(Integer, ForeignKey('limit_order.id'))
     name = Column(String)
     description = Column(String)
     image = Column(String)
     token_uri = Column(String)
-    asset_metadata = Column(JSON)
     nonce = Column(Integer, nullable=False)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')", persisted=True)))
 
     contract = relationship('TokenContract', back_populates='tokens')
     owner = relationship('Account', back_populates='tokens')
     latest_tx = relationship('Transaction')
     ask = relationship('LimitOrder', foreign_keys=ask_id, post_update=True)
+    token_metadata = relationship(
+        'TokenMetadata', back_populates='token', uselist=False, cascade='all, delete-orphan')
+
+    def set_metadata(self, document: dict):
+        """Requires `token_metadata` to be loaded, unless the token is new."""
+        from .TokenMetadata import TokenMetadata
+
+        if self.token_metadata is None:
+            self.token_metadata = TokenMetadata(document=document)
+        else:
+            self.token_metadata.document = document
 
 
 class TokenSchema(Schema):
@@ -34,3 +58,4 @@ class TokenSchema(Schema):
     name = fields.String()
     description = fields.String()
     image = fields.String()
+    thumbnails = fields.Function(lambda obj: thumbnail_urls(obj.image))
@@ -1,21 +1,34 @@
-from marshmallow import Schema, fields
-from sqlalchemy import Column, Integer, Boolean, String, ForeignKey
+from marshmallow import Schema, fields, missing
+from sqlalchemy import Column, Integer, Boolean, String, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from web3 import Web3
 
+from fluence.thumbnail import thumbnail_urls
 from .Base import Base
 from .Blueprint import BlueprintSchema
+from .CollectionStats import CollectionStatsSchema
+from .types import Address
+from fluence.utils import is_loaded
 
 KIND_ERC20 = 1
 KIND_ERC721 = 2
 
+SEARCH_CONFIG = 'english'
+
 
 class TokenContract(Base):
     __tablename__ = 'token_contract'
+    __table_args__ = (
+        Index('ix_token_contract_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_token_contract_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_token_contract_symbol_trgm', 'symbol',
+              postgresql_using='gin', postgresql_ops={'symbol': 'gin_trgm_ops'}),
+    )
 
     id = Column(Integer, primary_key=True)
-    _address = Column('address', String, unique=True, nullable=False)
+    _address = Column('address', Address, unique=True, nullable=False)
     fungible = Column(Boolean, nullable=False)
     blueprint_id = Column(Integer, ForeignKey('blueprint.id'), unique=True)
     name = Column(String)
@@ -23,9 +36,14 @@ class TokenContract(Base):
     decimals = Column(Integer)
     base_uri = Column(String)
     image = Column(String)
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(symbol, '')), 'A')", persisted=True)))
 
     blueprint = relationship('Blueprint', back_populates='contract', uselist=False)
     tokens = relationship('Token', back_populates='contract')
+    # Only dumped where the query loaded it, see `is_loaded`.
+    stats = relationship('CollectionStats', back_populates='contract', uselist=False)
 
     @hybrid_property
     def address(self):
@@ -44,3 +62,11 @@ class TokenContractSchema(Schema):
     symbol = fields.String()
     decimals = fields.Integer()
     image = fields.String()
+    thumbnails = fields.Function(lambda obj: thumbnail_urls(obj.image))
+    stats = fields.Nested(CollectionStatsSchema(), allow_none=True)
+
+    def get_attribute(self, obj, attr, default):
+        if attr == 'stats' and not is_loaded(obj, attr):
+            return missing
+
+        return super().get_attribute(obj, attr, default)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, JSON, ForeignKey
+from sqlalchemy.orm import relationship
+
+from .Base import Base
+
+
+class TokenMetadata(Base):
+    __tablename__ = 'token_metadata'
+
+    token_id = Column(Integer, ForeignKey('token.id'), primary_key=True)
+    document = Column(JSON, nullable=False)
+
+    token = relationship('Token', back_populates='token_metadata')
@@ -1,16 +1,24 @@
-from sqlalchemy import Column, Integer, String, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .Base import Base
+from .types import Hash
 
 TYPE_DEPLOY = 'DEPLOY'
 
 
 class Transaction(Base):
     __tablename__ = 'transaction'
+    __table_args__ = (
+        Index('ix_transaction_contract_id_block_number', 'contract_id', 'block_number'),
+        # Partitions are created by the crawler, see fluence.partitions.
+        {'postgresql_partition_by': 'RANGE (block_number)'},
+    )
 
-    id = Column(Integer, primary_key=True)
-    hash = Column(String, unique=True, nullable=False)
-    block_number = Column(Integer, ForeignKey('block.id'), nullable=False)
+    # The partition key has to be part of the primary key, so `id` alone is not unique to postgres
+    # and other tables refer to transactions by `(id, block_number)`.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    hash = Column(Hash, nullable=False, index=True)
+    block_number = Column(Integer, ForeignKey('block.id'), primary_key=True, autoincrement=False)
     transaction_index = Column(Integer, nullable=False)
     type = Column(String, nullable=False)
     contract_id = Column(Integer, ForeignKey('stark_contract.id'), nullable=False)
@@ -1,10 +1,17 @@
 from .Base import Base
 from .Block import Block
+from .BlockArchive import BlockArchive
 from .StarkContract import StarkContract
 from .Transaction import Transaction
 
 from .Account import Account
+from .Balance import Balance, BalanceSchema
 from .Blueprint import Blueprint, BlueprintSchema
+from .CollectionStats import CollectionStats, CollectionStatsSchema
+from .Event import Event
+from .Ledger import Ledger
 from .LimitOrder import LimitOrder, LimitOrderSchema, State
+from .OrderBook import OrderBook
 from .Token import Token, TokenSchema
 from .TokenContract import TokenContract, TokenContractSchema
+from .TokenMetadata import TokenMetadata
@@ -0,0 +1,73 @@
+import json
+import zlib
+from decimal import Decimal
+
+from sqlalchemy.types import TypeDecorator, LargeBinary
+
+from fluence.utils import parse_int, to_checksum_address
+
+
+class _FixedBytes(TypeDecorator):
+    """Stores an integer big-endian in a fixed number of bytes, so byte order is numeric order."""
+
+    impl = LargeBinary
+    cache_ok = True
+    width = 32
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+
+        return (parse_int(value) if isinstance(value, str) else int(value)).to_bytes(self.width, byteorder='big')
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+
+        return self.present(int.from_bytes(value, byteorder='big'))
+
+    def present(self, value: int):
+        """Shapes the integer read back; subclasses present it the way their columns did before."""
+        return value
+
+
+class Felt(_FixedBytes):
+    """A field element such as a stark key or token id, read back as `Decimal` like `Numeric` did."""
+
+    def present(self, value: int) -> Decimal:
+        return Decimal(value)
+
+
+class Hash(_FixedBytes):
+    """A block or transaction hash or a contract address on StarkNet, read back as `'0x%x'`."""
+
+    def present(self, value: int) -> str:
+        return '0x%x' % value
+
+
+class Address(_FixedBytes):
+    """An Ethereum address, read back checksummed."""
+
+    width = 20
+
+    def present(self, value: int) -> str:
+        return to_checksum_address(value)
+
+
+class CompressedJSON(TypeDecorator):
+    """A JSON document stored zlib-compressed."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+
+        return zlib.compress(json.dumps(value, separators=(',', ':')).encode())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+
+        return json.loads(zlib.decompress(value))
@@ -0,0 +1,39 @@
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+BLOCKS_PER_PARTITION = 100000
+PARTITIONED_TABLES = ['block', 'transaction']
+
+
+def create_partitions(n: int) -> list[str]:
+    lo, hi = n * BLOCKS_PER_PARTITION, (n + 1) * BLOCKS_PER_PARTITION
+
+    return [f'CREATE TABLE IF NOT EXISTS "{table}_p{n}" PARTITION OF "{table}" FOR VALUES FROM ({lo}) TO ({hi})'
+            for table in PARTITIONED_TABLES]
+
+
+class PartitionKeeper:
+    """Creates the block-range partitions of `block` and `transaction` before rows arrive for them."""
+
+    def __init__(self, async_session: sessionmaker, ahead: int = 1):
+        self._async_session = async_session
+        self._ahead = ahead
+        self._created: set[int] = set()
+
+    async def ensure(self, block_number: int):
+        n = block_number // BLOCKS_PER_PARTITION
+        missing = [i for i in range(n, n + self._ahead + 1) if i not in self._created]
+        if not missing:
+            return
+
+        # Attaching locks the parent, so it is done in its own short transaction.
+        async with self._async_session() as session:
+            for i in missing:
+                logging.warning(f'create_partition(n={i})')
+                for ddl in create_partitions(i):
+                    await session.execute(text(ddl))
+            await session.commit()
+
+        self._created.update(missing)
@@ -0,0 +1,129 @@
+"""Column-projected reads for list endpoints.
+
+Rows are plain namedtuples shaped like the ORM objects the serializers expect, so pages can be
+read without entity instrumentation, the identity map or the columns nobody dumps.
+"""
+from collections import namedtuple
+
+import click
+from sqlalchemy import select, and_
+from sqlalchemy.orm import aliased
+
+from fluence.models import Account, Blueprint, CollectionStats, Token, TokenContract, Ledger, Transaction
+
+AccountRow = namedtuple('AccountRow', ['stark_key', 'address'])
+BlueprintRow = namedtuple('BlueprintRow', ['permanent_id', 'minter', 'expire_at'])
+CollectionStatsRow = namedtuple(
+    'CollectionStatsRow', ['item_count', 'owner_count', 'sale_count', 'volume', 'last_sale_price'])
+TokenContractRow = namedtuple(
+    'TokenContractRow', ['address', 'fungible', 'blueprint', 'name', 'symbol', 'decimals', 'image', 'stats'])
+TokenRow = namedtuple('TokenRow', ['id', 'contract', 'token_id', 'name', 'description', 'image'])
+LedgerRow = namedtuple(
+    'LedgerRow', ['id', 'kind', 'contract', 'token_id', 'amount', 'from_', 'to', 'transaction_hash', 'block_number'])
+
+
+def select_tokens():
+    """Selects the columns of `TokenRow`, joined through the contract, its stats, blueprint and minter."""
+    minter = aliased(Account)
+
+    return select(
+        Token.id, Token.token_id, Token.name, Token.description, Token.image,
+        TokenContract._address, TokenContract.fungible, TokenContract.name, TokenContract.symbol,
+        TokenContract.decimals, TokenContract.image,
+        Blueprint.id, Blueprint.permanent_id, Blueprint.expire_at,
+        minter.stark_key, minter._address,
+        CollectionStats.contract_id, CollectionStats.item_count, CollectionStats.owner_count,
+        CollectionStats.sale_count, CollectionStats.volume, CollectionStats.last_sale_price). \
+        join(Token.contract). \
+        outerjoin(TokenContract.stats). \
+        outerjoin(TokenContract.blueprint). \
+        outerjoin(minter, Blueprint.minter)
+
+
+def token_row(row) -> TokenRow:
+    (id_, token_id, name, description, image,
+     address, fungible, contract_name, symbol, decimals, contract_image,
+     blueprint_id, permanent_id, expire_at,
+     stark_key, minter_address,
+     stats_id, *stats) = row
+    blueprint = BlueprintRow(permanent_id, AccountRow(stark_key, minter_address), expire_at) \
+        if blueprint_id is not None else None
+    stats = CollectionStatsRow(*stats) if stats_id is not None else None
+
+    return TokenRow(
+        id_,
+        TokenContractRow(address, fungible, blueprint, contract_name, symbol, decimals, contract_image, stats),
+        token_id, name, description, image)
+
+
+def select_ledger():
+    """Selects the columns of `LedgerRow`, joined through the contract, token, accounts and transaction."""
+    from_, to = aliased(Account), aliased(Account)
+
+    return select(
+        Ledger.id, Ledger.kind, TokenContract._address, Token.token_id, Ledger.amount,
+        from_.stark_key, to.stark_key, Transaction.hash, Ledger.block_number). \
+        join(Ledger.contract). \
+        outerjoin(Ledger.token). \
+        outerjoin(from_, Ledger.from_id == from_.id). \
+        outerjoin(to, Ledger.to_id == to.id). \
+        join(Transaction, and_(Transaction.id == Ledger.tx_id, Transaction.block_number == Ledger.block_number))
+
+
+def ledger_row(row) -> LedgerRow:
+    return LedgerRow(*row)
+
+
+async def compare(size: int, repeat: int):
+    import time
+    import tracemalloc
+
+    from sqlalchemy import desc
+    from sqlalchemy.orm import selectinload
+
+    from fluence.serializers import dump_token
+    from fluence.services import async_session
+
+    async def orm_page(session):
+        tokens = (await session.execute(
+            select(Token).
+            order_by(desc(Token.id)).
+            limit(size).
+            options(
+                selectinload(Token.contract).
+                selectinload(TokenContract.blueprint).
+                selectinload(Blueprint.minter)))).scalars().all()
+
+        return list(map(dump_token, tokens))
+
+    async def rows_page(session):
+        tokens = list(map(token_row, await session.execute(select_tokens().order_by(desc(Token.id)).limit(size))))
+
+        return list(map(dump_token, tokens))
+
+    for name, page in [('orm', orm_page), ('rows', rows_page)]:
+        elapsed = 0
+        tracemalloc.start()
+        for _ in range(repeat):
+            # A session per page, like a request, so the identity map starts empty every time.
+            async with async_session() as session:
+                started = time.perf_counter()
+                await page(session)
+                elapsed += time.perf_counter() - started
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{name}: {elapsed / repeat * 1000:.2f} ms, peak {peak >> 10} KiB per page of {size}')
+
+
+@click.command()
+@click.option('-n', '--size', default=100)
+@click.option('-r', '--repeat', default=50)
+def bench(size: int, repeat: int):
+    """Compares ORM loading with the projected rows above on the latest page of tokens."""
+    import asyncio
+
+    asyncio.run(compare(size, repeat))
+
+
+if __name__ == '__main__':
+    bench()
@@ -0,0 +1,39 @@
+"""Ranked text search over tokens and collections.
+
+Words are matched through the generated `search_vector` columns and their GIN indexes. Fragments of
+three characters or more also match inside names and symbols through their trigram indexes. Results
+rank by full-text rank plus the trigram similarity of the name.
+"""
+from sqlalchemy import select, func, or_, false, literal_column
+
+from fluence.models import Token, TokenContract
+from fluence.models.TokenContract import SEARCH_CONFIG
+from fluence.rows import select_tokens
+
+MIN_FRAGMENT = 3
+
+
+def _match(search_vector, names: list, q: str):
+    query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), q)
+    condition = search_vector.op('@@')(query)
+    if len(q) >= MIN_FRAGMENT:
+        pattern = '%' + q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        condition = or_(condition, *(name.ilike(pattern, escape='\\') for name in names))
+    rank = func.ts_rank(search_vector, query) + func.coalesce(func.similarity(names[0], q), 0)
+
+    return condition, rank.label('rank')
+
+
+def search_tokens(q: str):
+    """Selects the columns of `TokenRow` of the tokens matching `q`, followed by their rank."""
+    condition, rank = _match(Token.search_vector, [Token.name], q)
+
+    return select_tokens().where(condition).add_columns(rank), rank
+
+
+def search_collections(q: str):
+    """Selects the non-fungible collections matching `q` with their rank."""
+    condition, rank = _match(TokenContract.search_vector, [TokenContract.name, TokenContract.symbol], q)
+
+    return select(TokenContract, rank).where(TokenContract.fungible == false()).where(condition), rank
+
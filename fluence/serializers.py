@@ -0,0 +1,167 @@
+"""Hand-written equivalents of the list schemas, for the endpoints that dump pages of rows.
+
+Each function produces the same keys, in the same order and with the same value types, as
+the marshmallow schema it is named after.
+"""
+from typing import Optional
+
+import click
+
+from fluence.thumbnail import thumbnail_urls
+from fluence.utils import is_loaded
+
+try:
+    import orjson
+
+    def dumps(data) -> bytes:
+        return orjson.dumps(data)
+except ImportError:
+    import json
+
+    def dumps(data) -> bytes:
+        return json.dumps(data).encode()
+
+
+def _str(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def dump_account(account) -> Optional[dict]:
+    if account is None:
+        return None
+
+    return {
+        'stark_key': _str(account.stark_key),
+        'address': account.address,
+    }
+
+
+def dump_blueprint(blueprint) -> Optional[dict]:
+    if blueprint is None:
+        return None
+
+    return {
+        'permanent_id': blueprint.permanent_id,
+        'minter': dump_account(blueprint.minter),
+        'expire_at': blueprint.expire_at.isoformat() if blueprint.expire_at is not None else None,
+    }
+
+
+def dump_collection_stats(stats) -> Optional[dict]:
+    if stats is None:
+        return None
+
+    return {
+        'item_count': stats.item_count,
+        'owner_count': stats.owner_count,
+        'sale_count': stats.sale_count,
+        'volume': _str(stats.volume),
+        'last_sale_price': _str(stats.last_sale_price),
+    }
+
+
+def dump_token_contract(token_contract) -> Optional[dict]:
+    if token_contract is None:
+        return None
+
+    return {
+        'address': token_contract.address,
+        'fungible': token_contract.fungible,
+        'blueprint': dump_blueprint(token_contract.blueprint),
+        'name': token_contract.name,
+        'symbol': token_contract.symbol,
+        'decimals': token_contract.decimals,
+        'image': token_contract.image,
+        'thumbnails': thumbnail_urls(token_contract.image),
+        **({'stats': dump_collection_stats(token_contract.stats)} if is_loaded(token_contract, 'stats') else {}),
+    }
+
+
+def dump_token(token) -> Optional[dict]:
+    if token is None:
+        return None
+
+    return {
+        'contract': dump_token_contract(token.contract),
+        'token_id': _str(token.token_id),
+        'name': token.name,
+        'description': token.description,
+        'image': token.image,
+        'thumbnails': thumbnail_urls(token.image),
+    }
+
+
+def dump_limit_order(limit_order) -> dict:
+    return {
+        'order_id': _str(limit_order.order_id),
+        'user': dump_account(limit_order.user),
+        'bid': limit_order.bid,
+        'token': dump_token(limit_order.token),
+        'quote_contract': dump_token_contract(limit_order.quote_contract),
+        'quote_amount': _str(limit_order.quote_amount),
+        'state': limit_order.state.name,
+    }
+
+
+def dump_ledger(entry) -> dict:
+    return {
+        'kind': entry.kind,
+        'contract': entry.contract,
+        'token_id': _str(entry.token_id),
+        'amount': _str(entry.amount),
+        'from': _str(entry.from_),
+        'to': _str(entry.to),
+        'transaction_hash': entry.transaction_hash,
+        'block_number': entry.block_number,
+    }
+
+
+@click.command()
+@click.option('-n', '--count', default=100)
+@click.option('-r', '--repeat', default=200)
+def bench(count: int, repeat: int):
+    """Compares marshmallow + json with the serializers above on a page of limit orders."""
+    import json
+    import time
+    from decimal import Decimal
+
+    import pendulum
+
+    from fluence.models import Account, Blueprint, TokenContract, Token, LimitOrder, LimitOrderSchema
+
+    minter = Account(stark_key=Decimal(3 ** 150), address='0x' + '12' * 20)
+    quote_contract = TokenContract(
+        address='0x' + '34' * 20, fungible=True, name='Ether', symbol='ETH', decimals=18, image=None)
+    token_contract = TokenContract(
+        address='0x' + '56' * 20, fungible=False, name='Fluence', symbol='FLU', decimals=0,
+        blueprint=Blueprint(permanent_id='fluence', minter=minter, expire_at=pendulum.now()),
+        image='https://example.com/fs/ab/cd/abcd' + '0' * 36 + '.png')
+    limit_orders = [
+        LimitOrder(
+            order_id=Decimal(i),
+            user=minter,
+            bid=i % 2 == 0,
+            token=Token(
+                contract=token_contract, token_id=Decimal(i), name=f'Token #{i}',
+                description='A token ' * 20, image=f'https://example.com/{i}.png'),
+            quote_contract=quote_contract,
+            quote_amount=Decimal(10 ** 18 + i),
+            fulfilled=[None, True, False][i % 3])
+        for i in range(count)]
+
+    expected = {'data': list(map(LimitOrderSchema().dump, limit_orders)), 'total': count}
+    actual = {'data': list(map(dump_limit_order, limit_orders)), 'total': count}
+    assert json.dumps(expected) == json.dumps(actual)
+
+    for name, fn in [
+        ('marshmallow', lambda: json.dumps({'data': list(map(LimitOrderSchema().dump, limit_orders))}).encode()),
+        ('serializers', lambda: dumps({'data': list(map(dump_limit_order, limit_orders))})),
+    ]:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        print(f'{name}: {(time.perf_counter() - started) / repeat * 1000:.2f} ms per page of {count}')
+
+
+if __name__ == '__main__':
+    bench()
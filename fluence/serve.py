@@ -1,35 +1,51 @@
+import asyncio
 import functools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 from enum import Enum
-from typing import Union
+from pathlib import Path
+from typing import Optional
 
 import click
 import pendulum
 import pkg_resources
 import pyrsistent
-from aiohttp import web
+from aiohttp import web, hdrs
+from aiohttp.helpers import ETag, ETAG_ANY
 from aiohttp.web_request import Request
 from decouple import config
 from eth_account import Account
 from openapi_core import create_spec
 from rororo import OperationTableDef, setup_openapi, openapi_context
 from services.external_api.base_client import RetryConfig
-from sqlalchemy import select, desc, null, false, true
+from sqlalchemy import select, desc, null, false, true, text, or_, tuple_, union_all
 from sqlalchemy.exc import NoResultFound, IntegrityError
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, contains_eager
 from sqlalchemy.sql import functions
-from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash
-from starkware.crypto.signature.signature import verify
 from starkware.starknet.services.api.feeder_gateway.feeder_gateway_client import FeederGatewayClient
 from starkware.starknet.services.api.gateway.gateway_client import GatewayClient
 from web3 import Web3
 
+from fluence import sse
+from fluence.cache import LRUCache, SingleFlight
 from fluence.contracts.fluence import StarkFluence, LimitOrder, EtherFluence, ContractKind
 from fluence.contracts.forwarder import Forwarder, ReqSchema
-from fluence.utils import parse_int
+from fluence.events import EventBus
+from fluence.serializers import dumps, dump_token_contract, dump_token, dump_limit_order, dump_ledger
+from fluence.signature import Verifier
+from fluence.state import StateWatcher
+from fluence.thumbnail import SIZES, RASTER_EXTENSIONS, find_original, make_thumbnails, thumbnail_name
+from fluence.tracker import TxTracker, TrackerFull
+from fluence.utils import parse_int, encode_cursor, decode_cursor, to_checksum_address, ZERO_ADDRESS
 
 operations = OperationTableDef()
 
+ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+UPLOAD_CHUNK_SIZE = 1 << 18
+COMPRESSIBLE_TYPES = ['image/svg+xml', 'application/json', 'application/xml', 'application/javascript']
+
 
 class Status(Enum):
     NOT_RECEIVED = 'NOT_RECEIVED'
@@ -57,25 +73,38 @@ async def register_client(request: Request):
                             context.data['nonce'],
                             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
 async def get_client(request: Request):
     with openapi_context(request) as context:
-        stark_key = await request.config_dict['fluence']. \
-            get_client(context.parameters.path['address'])
-        if stark_key == 0:
-            return web.HTTPNotFound()
+        block_number = local_block_number(request, context)
+        if block_number is not None:
+            async with request.config_dict['async_session']() as session:
+                from fluence.models import Account
+
+                try:
+                    stark_key = (await session.execute(
+                        select(Account.stark_key).
+                        where(Account.address == to_checksum_address(context.parameters.path['address'])))).\
+                        scalar_one()
+                except NoResultFound:
+                    return web.HTTPNotFound()
+        else:
+            stark_key = await request.config_dict['fluence']. \
+                get_client(context.parameters.path['address'])
+            if stark_key == 0:
+                return web.HTTPNotFound()
 
-        return web.json_response({'stark_key': str(stark_key)})
+        return web.json_response({'stark_key': str(stark_key), 'block_number': block_number})
 
 
 @operations.register
 async def create_blueprint(request: Request):
     with openapi_context(request) as context:
         minter = Decimal(context.data['minter'])
-        if not authenticate(
+        if not await request.config_dict['verifier'].authenticate(
                 [context.data['permanent_id'].encode()],
                 context.parameters.query['signature'],
                 int(minter)):
@@ -101,6 +130,7 @@ async def create_blueprint(request: Request):
                 await session.commit()
             except IntegrityError:
                 return web.HTTPBadRequest()
+            request.config_dict['state'].bump()
 
             return web.json_response(BlueprintSchema().dump(blueprint))
 
@@ -110,10 +140,16 @@ async def find_collections(request: Request):
     with openapi_context(request) as context:
         page = context.parameters.query.get('page', 1)
         size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
         owner = context.parameters.query.get('owner')
+        sort = context.parameters.query.get('sort')
+        key = ('collections', owner, sort, page, size, after, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
 
         async with request.config_dict['async_session']() as session:
-            from fluence.models import TokenContract, TokenContractSchema, Account, Blueprint
+            from fluence.models import TokenContract, Account, Blueprint, CollectionStats
 
             def augment(stmt):
                 stmt = stmt.where(TokenContract.fungible == false())
@@ -121,23 +157,61 @@ async def find_collections(request: Request):
                     stmt = stmt.join(TokenContract.blueprint). \
                         join(Blueprint.minter). \
                         where(Account.address == owner)
+                if sort:
+                    stmt = stmt.join(TokenContract.stats)
 
                 return stmt
 
-            query = augment(select(TokenContract)). \
-                order_by(desc(TokenContract.id)). \
-                limit(size). \
-                offset(size * (page - 1))
+            if sort:
+                query = paginate_sorted(
+                    augment(select(TokenContract)).options(contains_eager(TokenContract.stats)),
+                    getattr(CollectionStats, sort), CollectionStats.contract_id, page, size, after)
+            else:
+                query = paginate(
+                    augment(select(TokenContract)).options(selectinload(TokenContract.stats)),
+                    TokenContract.id, page, size, after)
             count = augment(select(functions.count()).select_from(TokenContract))
+            token_contracts = (await session.execute(
+                query.options(
+                    selectinload(TokenContract.blueprint).
+                    selectinload(Blueprint.minter)))).scalars().all()
+            cursor = next_sorted_cursor(token_contracts, size, lambda c: getattr(c.stats, sort)) if sort else \
+                next_cursor(token_contracts, size)
+
+            return cache_response(request, key, {
+                'data': list(map(dump_token_contract, token_contracts)),
+                'total': await count_total(request, session, ('collections', owner, bool(sort)), count),
+                'cursor': cursor,
+            })
 
-            return web.json_response({
-                'data': list(map(
-                    TokenContractSchema().dump,
-                    (await session.execute(
-                        query.options(
-                            selectinload(TokenContract.blueprint).
-                            selectinload(Blueprint.minter)))).scalars())),
-                'total': (await session.execute(count)).scalar_one(),
+
+@operations.register
+async def search_collections(request: Request):
+    with openapi_context(request) as context:
+        q = context.parameters.query['q']
+        size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
+        key = ('search_collections', q, size, after, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
+
+        async with request.config_dict['async_session']() as session:
+            from fluence.models import TokenContract, Blueprint
+            from fluence import search
+
+            stmt, rank = search.search_collections(q)
+            rows = (await session.execute(
+                paginate_sorted(stmt, rank, TokenContract.id, 1, size, after).
+                options(
+                    selectinload(TokenContract.stats),
+                    selectinload(TokenContract.blueprint).
+                    selectinload(Blueprint.minter)))).all()
+            token_contracts = [token_contract for token_contract, _rank in rows]
+
+            return cache_response(request, key, {
+                'data': list(map(dump_token_contract, token_contracts)),
+                'cursor': next_sorted_cursor(rows, size, lambda row: row.rank, lambda row: row[0].id),
             })
 
 
@@ -169,7 +243,7 @@ async def register_collection(request: Request):
                 blueprint = Blueprint(account)
                 session.add(blueprint)
 
-            if not authenticate(
+            if not await request.config_dict['verifier'].authenticate(
                     [context.data['address'],
                      context.data['name'].encode(),
                      context.data['symbol'].encode(),
@@ -194,6 +268,7 @@ async def register_collection(request: Request):
                 *request.config_dict['ether_fluence'].register_contract(
                     token_contract.address, ContractKind.ERC721, int(blueprint.minter.stark_key)))
             await session.commit()
+            request.config_dict['state'].bump()
 
             return web.json_response({
                 'req': ReqSchema().dump(req),
@@ -204,20 +279,28 @@ async def register_collection(request: Request):
 @operations.register
 async def get_metadata_by_permanent_id(request: Request):
     with openapi_context(request) as context:
-        async with request.config_dict['async_session']() as session:
-            from fluence.models import Token, TokenContract, Blueprint
+        token_id = parse_int(context.parameters.path['token_id'])
+        permanent_id = context.parameters.path['permanent_id']
+        key = ('permanent_id', permanent_id, token_id, request.config_dict['state'].version)
+        cached = request.config_dict['metadata_cache'].get(key)
+        if cached is None:
+            async with request.config_dict['async_session']() as session:
+                from fluence.models import Token, TokenContract, Blueprint, TokenMetadata
 
-            try:
-                token = (await session.execute(
-                    select(Token).
-                    join(Token.contract).
-                    join(TokenContract.blueprint).
-                    where(Token.token_id == parse_int(context.parameters.path['token_id'])).
-                    where(Blueprint.permanent_id == context.parameters.path['permanent_id']))).scalar_one()
+                try:
+                    nonce, document = (await session.execute(
+                        select(Token.nonce, TokenMetadata.document).
+                        join(Token.contract).
+                        join(TokenContract.blueprint).
+                        outerjoin(Token.token_metadata).
+                        where(Token.token_id == token_id).
+                        where(Blueprint.permanent_id == permanent_id))).one()
+                except NoResultFound:
+                    return web.HTTPNotFound()
 
-                return web.json_response(token.asset_metadata)
-            except NoResultFound:
-                return web.HTTPNotFound()
+            cached = cache_metadata(request, key, nonce, document)
+
+        return metadata_response(request, *cached)
 
 
 @operations.register
@@ -225,19 +308,25 @@ async def get_metadata(request: Request):
     with openapi_context(request) as context:
         token_id = parse_int(context.parameters.path['token_id'])
         address = Web3.toChecksumAddress(context.parameters.path['address'])
-        async with request.config_dict['async_session']() as session:
-            from fluence.models import TokenContract, Token
+        key = ('address', address, token_id, request.config_dict['state'].version)
+        cached = request.config_dict['metadata_cache'].get(key)
+        if cached is None:
+            async with request.config_dict['async_session']() as session:
+                from fluence.models import TokenContract, Token, TokenMetadata
 
-            try:
-                token = (await session.execute(
-                    select(Token).
-                    join(Token.contract).
-                    where(Token.token_id == token_id).
-                    where(TokenContract.address == address))).scalar_one()
+                try:
+                    nonce, document = (await session.execute(
+                        select(Token.nonce, TokenMetadata.document).
+                        join(Token.contract).
+                        outerjoin(Token.token_metadata).
+                        where(Token.token_id == token_id).
+                        where(TokenContract.address == address))).one()
+                except NoResultFound:
+                    return web.HTTPNotFound()
 
-                return web.json_response(token.asset_metadata)
-            except NoResultFound:
-                return web.HTTPNotFound()
+            cached = cache_metadata(request, key, nonce, document)
+
+        return metadata_response(request, *cached)
 
 
 @operations.register
@@ -264,12 +353,14 @@ async def update_metadata(request: Request):
                     select(Token).
                     where(Token.token_id == token_id).
                     where(Token.contract == token_contract).
-                    options(selectinload(Token.contract)))).scalar_one()
+                    options(
+                        selectinload(Token.contract),
+                        selectinload(Token.token_metadata)))).scalar_one()
             except NoResultFound:
                 token = Token(contract=token_contract, token_id=token_id, nonce=0)
                 session.add(token)
 
-            if not authenticate(
+            if not await request.config_dict['verifier'].authenticate(
                     [token_contract.address, token_id, token.nonce],
                     context.parameters.query['signature'],
                     int(token_contract.blueprint.minter.stark_key)):
@@ -278,10 +369,11 @@ async def update_metadata(request: Request):
             token.name = context.data['name']
             token.description = context.data['description']
             token.image = context.data['image']
-            token.asset_metadata = pyrsistent.thaw(context.data)
+            token.set_metadata(pyrsistent.thaw(context.data))
             token.nonce += 1
 
             await session.commit()
+            request.config_dict['state'].bump()
 
             return web.json_response(TokenSchema().dump(token))
 
@@ -291,58 +383,213 @@ async def find_tokens(request: Request):
     with openapi_context(request) as context:
         page = context.parameters.query.get('page', 1)
         size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
         owner = context.parameters.query.get('owner')
         collection = context.parameters.query.get('collection')
+        estimate = context.parameters.query.get('estimate', False)
+        key = ('tokens', owner, collection, estimate, page, size, after, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
 
         async with request.config_dict['async_session']() as session:
-            from fluence.models import Token, TokenSchema, TokenContract, Account, Blueprint
+            from fluence.models import Token, TokenContract, Account
+            from fluence.rows import select_tokens, token_row
 
-            def augment(stmt):
+            def augment(stmt, contract_joined=False):
                 if owner:
                     stmt = stmt.join(Token.owner). \
                         where(Account.address == owner)
                 if collection:
-                    stmt = stmt.join(Token.contract). \
-                        where(TokenContract.address == collection)
+                    if not contract_joined:
+                        stmt = stmt.join(Token.contract)
+                    stmt = stmt.where(TokenContract.address == collection)
 
                 return stmt
 
-            query = augment(select(Token)). \
-                order_by(desc(Token.id)). \
-                limit(size). \
-                offset(size * (page - 1))
+            query = paginate(augment(select_tokens(), True), Token.id, page, size, after)
             count = augment(select(functions.count()).select_from(Token))
+            tokens = list(map(token_row, await session.execute(query)))
+
+            return cache_response(request, key, {
+                'data': list(map(dump_token, tokens)),
+                'total': await count_total(
+                    request, session, ('tokens', owner, collection), count,
+                    Token.__table__ if estimate and not (owner or collection) else None),
+                'cursor': next_cursor(tokens, size),
+            })
 
-            return web.json_response({
-                'data': list(map(
-                    TokenSchema().dump,
-                    (await session.execute(
-                        query.options(
-                            selectinload(Token.contract).
-                            selectinload(TokenContract.blueprint).
-                            selectinload(Blueprint.minter)))).scalars())),
-                'total': (await session.execute(count)).scalar_one(),
+
+@operations.register
+async def search_tokens(request: Request):
+    with openapi_context(request) as context:
+        q = context.parameters.query['q']
+        size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
+        key = ('search_tokens', q, size, after, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
+
+        async with request.config_dict['async_session']() as session:
+            from fluence.models import Token
+            from fluence import search
+            from fluence.rows import token_row
+
+            stmt, rank = search.search_tokens(q)
+            rows = (await session.execute(paginate_sorted(stmt, rank, Token.id, 1, size, after))).all()
+            tokens = [token_row(row[:-1]) for row in rows]
+
+            return cache_response(request, key, {
+                'data': list(map(dump_token, tokens)),
+                'cursor': next_sorted_cursor(rows, size, lambda row: row.rank),
             })
 
 
 @operations.register
 async def get_balance(request: Request):
     with openapi_context(request) as context:
-        balance = await request.config_dict['fluence'].get_balance(
-            context.parameters.query['user'],
-            context.parameters.query['contract'])
+        block_number = local_block_number(request, context)
+        if block_number is not None:
+            async with request.config_dict['async_session']() as session:
+                from fluence.models import Balance, Account, TokenContract
 
-        return web.json_response({'balance': str(balance)})
+                user = parse_int(context.parameters.query['user'])
+                contract = to_checksum_address(context.parameters.query['contract'])
+                try:
+                    balance = (await session.execute(
+                        select(Balance.amount).
+                        join(Balance.account).
+                        join(Balance.contract).
+                        where(Account.stark_key == user).
+                        where(TokenContract.address == contract))).scalar_one()
+                except NoResultFound:
+                    balance = 0
+        else:
+            balance = await request.config_dict['fluence'].get_balance(
+                context.parameters.query['user'],
+                context.parameters.query['contract'])
+
+        return web.json_response({'balance': str(balance), 'block_number': block_number})
+
+
+@operations.register
+async def find_balances(request: Request):
+    with openapi_context(request) as context:
+        async with request.config_dict['async_session']() as session:
+            from fluence.models import Balance, BalanceSchema, Account, TokenContract, Blueprint
+
+            balances = (await session.execute(
+                select(Balance).
+                join(Balance.account).
+                where(Account.stark_key == parse_int(context.parameters.query['user'])).
+                where(Balance.amount > 0).
+                order_by(Balance.contract_id).
+                options(
+                    selectinload(Balance.contract).
+                    selectinload(TokenContract.blueprint).
+                    selectinload(Blueprint.minter)))).scalars()
+
+            return web.json_response({
+                'data': list(map(BalanceSchema().dump, balances)),
+                'block_number': request.config_dict['state'].block_counter - 1
+                if request.config_dict['state'].block_counter is not None else None,
+            })
 
 
 @operations.register
 async def get_owner(request: Request):
     with openapi_context(request) as context:
-        owner = await request.config_dict['fluence'].get_owner(
-            context.parameters.query['token_id'],
-            context.parameters.query['contract'])
+        block_number = local_block_number(request, context)
+        if block_number is not None:
+            async with request.config_dict['async_session']() as session:
+                from fluence.models import Token, TokenContract, LimitOrder
+
+                try:
+                    token = (await session.execute(
+                        select(Token).
+                        join(Token.contract).
+                        where(Token.token_id == parse_int(context.parameters.query['token_id'])).
+                        where(TokenContract.address == to_checksum_address(context.parameters.query['contract'])).
+                        options(selectinload(Token.owner)))).scalar_one()
+                    # Tokens on an open ask are escrowed by the contract, which reports no owner. `Token.ask`
+                    # cannot tell, the interpreter also points it at bids.
+                    escrowed = (await session.execute(
+                        select(LimitOrder.id).
+                        where(LimitOrder.token_id == token.id).
+                        where(LimitOrder.bid == false()).
+                        where(LimitOrder.fulfilled == null()).
+                        limit(1))).first() is not None
+                    owner = token.owner.stark_key if token.owner and not escrowed else 0
+                except NoResultFound:
+                    owner = 0
+        else:
+            owner = await request.config_dict['fluence'].get_owner(
+                context.parameters.query['token_id'],
+                context.parameters.query['contract'])
+
+        return web.json_response({'owner': str(owner), 'block_number': block_number})
+
+
+@operations.register
+async def find_token_history(request: Request):
+    with openapi_context(request) as context:
+        size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
+        address = Web3.toChecksumAddress(context.parameters.path['address'])
+        token_id = parse_int(context.parameters.path['token_id'])
+        key = ('token_history', address, token_id, size, after, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
 
-        return web.json_response({'owner': str(owner)})
+        async with request.config_dict['async_session']() as session:
+            from fluence.models import Ledger, Token, TokenContract
+            from fluence.rows import select_ledger, ledger_row
+
+            token = select(Token.id). \
+                join(Token.contract). \
+                where(TokenContract.address == address). \
+                where(Token.token_id == token_id). \
+                scalar_subquery()
+            query = paginate(select_ledger().where(Ledger.token_id == token), Ledger.id, 1, size, after)
+            entries = list(map(ledger_row, await session.execute(query)))
+
+            return cache_response(request, key, {
+                'data': list(map(dump_ledger, entries)),
+                'cursor': next_cursor(entries, size),
+            })
+
+
+@operations.register
+async def find_activity(request: Request):
+    with openapi_context(request) as context:
+        size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
+        user = parse_int(context.parameters.query['user'])
+        key = ('activity', user, size, after, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
+
+        async with request.config_dict['async_session']() as session:
+            from fluence.models import Ledger, Account
+            from fluence.rows import select_ledger, ledger_row
+
+            account = select(Account.id).where(Account.stark_key == user).scalar_subquery()
+            # Each side is a backward range scan of its (account, id) index; OR-ing them would not be.
+            latest = union_all(*(
+                paginate(select(Ledger.id).where(column == account), Ledger.id, 1, size, after)
+                for column in [Ledger.from_id, Ledger.to_id])).subquery()
+            query = paginate(
+                select_ledger().where(Ledger.id.in_(select(latest.c.id))),
+                Ledger.id, 1, size, after)
+            entries = list(map(ledger_row, await session.execute(query)))
+
+            return cache_response(request, key, {
+                'data': list(map(dump_ledger, entries)),
+                'cursor': next_cursor(entries, size),
+            })
 
 
 @operations.register
@@ -355,7 +602,7 @@ async def mint(request: Request):
             context.data['nonce'],
             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
@@ -369,7 +616,7 @@ async def withdraw(request: Request):
             context.data['nonce'],
             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
@@ -383,7 +630,7 @@ async def transfer(request: Request):
             context.data['nonce'],
             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
@@ -391,47 +638,102 @@ async def find_orders(request: Request):
     with openapi_context(request) as context:
         page = context.parameters.query.get('page', 1)
         size = context.parameters.query.get('size', 100)
+        after = context.parameters.query.get('after')
         user = context.parameters.query.get('user')
         collection = context.parameters.query.get('collection')
         side = context.parameters.query.get('side')
         state = context.parameters.query.get('state')
+        estimate = context.parameters.query.get('estimate', False)
+        key = ('orders', user, collection, side, state, estimate, page, size, after,
+               request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
 
     async with request.config_dict['async_session']() as session:
-        from fluence.models import LimitOrder, LimitOrderSchema, Account, Token, TokenContract
+        from fluence.models import LimitOrder, Account, TokenContract
 
         def augment(stmt):
             if user:
                 stmt = stmt.join(LimitOrder.user). \
                     where(Account.address == user)
             if collection:
-                stmt = stmt.join(LimitOrder.token). \
-                    join(Token.contract). \
+                stmt = stmt.join(LimitOrder.base_contract). \
                     where(TokenContract.address == collection)
             if side:
                 stmt = stmt.where(LimitOrder.bid == (side == 'bid'))
-            if state:
+            if state is not None:
                 stmt = stmt.where(LimitOrder.fulfilled == [null(), true(), false()][state])
 
             return stmt
 
-        query = augment(select(LimitOrder)). \
-            order_by(desc(LimitOrder.id)). \
-            limit(size). \
-            offset(size * (page - 1))
+        query = paginate(augment(select(LimitOrder)), LimitOrder.id, page, size, after)
         count = augment(select(functions.count()).select_from(LimitOrder))
-
-        return web.json_response({
-            'data': list(map(
-                LimitOrderSchema().dump,
-                (await session.execute(
-                    query.options(
-                        selectinload(LimitOrder.user),
-                        selectinload(LimitOrder.token).selectinload(Token.contract),
-                        selectinload(LimitOrder.quote_contract)))).scalars())),
-            'total': (await session.execute(count)).scalar_one(),
+        limit_orders = (await session.execute(query.options(*load_limit_order()))).scalars().all()
+
+        return cache_response(request, key, {
+            'data': list(map(dump_limit_order, limit_orders)),
+            'total': await count_total(
+                request, session, ('orders', user, collection, side, state), count,
+                LimitOrder.__table__ if estimate and not (user or collection or side) and state is None else None),
+            'cursor': next_cursor(limit_orders, size),
         })
 
 
+@operations.register
+async def get_order_book(request: Request):
+    with openapi_context(request) as context:
+        address = Web3.toChecksumAddress(context.parameters.path['address'])
+        quote = Web3.toChecksumAddress(context.parameters.query.get('quote', ZERO_ADDRESS))
+        depth = context.parameters.query.get('depth', 20)
+        key = ('order_book', address, quote, depth, request.config_dict['state'].version)
+        response = cached_response(request, key)
+        if response is not None:
+            return response
+
+    async with request.config_dict['async_session']() as session:
+        from fluence.models import LimitOrder, OrderBook, TokenContract
+
+        base_contract = select(TokenContract.id).where(TokenContract.address == address).scalar_subquery()
+        quote_contract = select(TokenContract.id).where(TokenContract.address == quote).scalar_subquery()
+
+        # One index scan serves each side: asks read it forward, bids backward.
+        order = [LimitOrder.quote_amount, LimitOrder.id]
+
+        def best(bid: bool):
+            return select(LimitOrder.id). \
+                where(LimitOrder.base_contract_id == base_contract). \
+                where(LimitOrder.quote_contract_id == quote_contract). \
+                where(LimitOrder.bid == bid). \
+                where(LimitOrder.fulfilled.is_(None)). \
+                order_by(*(map(desc, order) if bid else order)). \
+                limit(depth)
+
+        # Both sides are read off the order book index in a single statement, then split here.
+        limit_orders = (await session.execute(
+            select(LimitOrder).
+            where(or_(LimitOrder.id.in_(best(False)), LimitOrder.id.in_(best(True)))).
+            options(*load_limit_order()))).scalars().all()
+        order_books = {order_book.bid: order_book for order_book in (await session.execute(
+            select(OrderBook).
+            where(OrderBook.base_contract_id == base_contract).
+            where(OrderBook.quote_contract_id == quote_contract))).scalars()}
+
+        def side(bid: bool) -> dict:
+            order_book = order_books.get(bid)
+            orders = sorted(
+                (o for o in limit_orders if o.bid == bid),
+                key=lambda o: (o.quote_amount, o.id), reverse=bid)
+
+            return {
+                'orders': list(map(dump_limit_order, orders)),
+                'count': order_book.open_count if order_book else 0,
+                'best_price': str(order_book.best_price) if order_book and order_book.best_price is not None else None,
+            }
+
+        return cache_response(request, key, {'asks': side(False), 'bids': side(True)})
+
+
 @operations.register
 async def create_order(request: Request):
     with openapi_context(request) as context:
@@ -440,7 +742,7 @@ async def create_order(request: Request):
             LimitOrder(**context.data.discard('order_id'), state=0),
             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
@@ -448,11 +750,36 @@ async def get_order(request: Request):
     with openapi_context(request) as context:
         from fluence.contracts import LimitOrderSchema
 
-        limit_order = await request.config_dict['fluence'].get_order(context.parameters.path['id'])
-        if parse_int(limit_order.user) == 0:
-            return web.HTTPNotFound()
+        block_number = local_block_number(request, context)
+        if block_number is not None:
+            async with request.config_dict['async_session']() as session:
+                from fluence import models
 
-        return web.json_response(LimitOrderSchema().dump(limit_order))
+                try:
+                    order = (await session.execute(
+                        select(models.LimitOrder).
+                        where(models.LimitOrder.order_id == parse_int(context.parameters.path['id'])).
+                        options(
+                            selectinload(models.LimitOrder.user),
+                            selectinload(models.LimitOrder.token).selectinload(models.Token.contract),
+                            selectinload(models.LimitOrder.quote_contract)))).scalar_one()
+                except NoResultFound:
+                    return web.HTTPNotFound()
+
+            limit_order = LimitOrder(
+                user=order.user.stark_key,
+                bid=order.bid,
+                base_contract=order.token.contract.address,
+                base_token_id=order.token.token_id,
+                quote_contract=order.quote_contract.address,
+                quote_amount=order.quote_amount,
+                state=order.state)
+        else:
+            limit_order = await request.config_dict['fluence'].get_order(context.parameters.path['id'])
+            if parse_int(limit_order.user) == 0:
+                return web.HTTPNotFound()
+
+        return web.json_response({**LimitOrderSchema().dump(limit_order), 'block_number': block_number})
 
 
 @operations.register
@@ -464,7 +791,7 @@ async def fulfill_order(request: Request):
             context.data['nonce'],
             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
@@ -475,13 +802,19 @@ async def cancel_order(request: Request):
             context.parameters.query['nonce'],
             context.parameters.query['signature'])
 
-        return web.json_response({'transaction_hash': tx})
+        return transacted(request, tx)
 
 
 @operations.register
 async def get_tx_status(request: Request):
-    status = await request.config_dict['feeder_gateway']. \
-        get_transaction_status(tx_hash=request.match_info['hash'])
+    tx_hash = request.match_info['hash']
+    tx = await find_final_tx(request, tx_hash)
+    if tx is not None:
+        return web.json_response({'block_hash': tx['block_hash'], 'tx_status': tx['status']})
+
+    status = await request.config_dict['feeder_calls'].do(
+        ('get_transaction_status', tx_hash),
+        lambda: request.config_dict['feeder_gateway'].get_transaction_status(tx_hash=tx_hash))
     if status['tx_status'] == Status.NOT_RECEIVED.value:
         return web.HTTPNotFound()
 
@@ -492,8 +825,10 @@ async def get_tx_status(request: Request):
 async def inspect_tx(request: Request):
     from starkware.starknet.public.abi import get_selector_from_name
 
-    tx = await request.config_dict['feeder_gateway']. \
-        get_transaction(tx_hash=request.match_info['hash'])
+    tx_hash = request.match_info['hash']
+    tx = await find_final_tx(request, tx_hash) or await request.config_dict['feeder_calls'].do(
+        ('get_transaction', tx_hash),
+        lambda: request.config_dict['feeder_gateway'].get_transaction(tx_hash=tx_hash))
     if tx['status'] == Status.NOT_RECEIVED.value or \
             parse_int(tx['transaction']['entry_point_selector']) != get_selector_from_name('transfer') or \
             tx['transaction']['entry_point_type'] != 'EXTERNAL':
@@ -508,11 +843,128 @@ async def inspect_tx(request: Request):
     })
 
 
+def transacted(request: Request, tx: str) -> web.Response:
+    request.config_dict['tracker'].track(tx)
+
+    return web.json_response({'transaction_hash': tx})
+
+
+async def watch_tx(request: Request):
+    tx_hash = request.match_info['hash']
+    tracker = request.config_dict['tracker']
+    try:
+        queue = tracker.subscribe(tx_hash)
+    except TrackerFull:
+        raise web.HTTPServiceUnavailable()
+    try:
+        response = await sse.open_stream(request)
+        while True:
+            try:
+                status = await asyncio.wait_for(queue.get(), request.config_dict['keep_alive'])
+            except asyncio.TimeoutError:
+                await sse.keep_alive(response)
+                continue
+
+            if status is None:
+                break
+
+            await sse.send(response, status, event='status')
+    finally:
+        tracker.unsubscribe(tx_hash, queue)
+
+    return response
+
+
+async def watch_events(request: Request):
+    collection = request.query.get('collection')
+    account = request.query.get('account')
+    after = request.headers.get(hdrs.LAST_EVENT_ID) or request.query.get('after')
+    try:
+        collection = collection and to_checksum_address(collection)
+        account = account and str(parse_int(account))
+        last, = decode_cursor(after) if after else [None]
+    except ValueError:
+        return web.HTTPBadRequest()
+    if last is not None and not isinstance(last, int):
+        return web.HTTPBadRequest()
+
+    def predicate(event: dict) -> bool:
+        return (not collection or event['contract'] == collection) and \
+            (not account or account in event['accounts'])
+
+    bus = request.config_dict['events']
+    queue = bus.subscribe(predicate)
+    try:
+        response = await sse.open_stream(request)
+        if last is None:
+            last = bus.cursor
+        else:
+            while True:
+                events = await bus.replay(last, predicate, request.config_dict['replay_batch'])
+                for event in events:
+                    await sse.send(response, event, event=event['kind'], id_=encode_cursor(event['id']))
+                    last = event['id']
+                if len(events) < request.config_dict['replay_batch']:
+                    break
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), request.config_dict['keep_alive'])
+            except asyncio.TimeoutError:
+                await sse.keep_alive(response)
+                continue
+
+            if event is None:
+                break
+            if last is not None and event['id'] <= last:
+                continue
+
+            await sse.send(response, event, event=event['kind'], id_=encode_cursor(event['id']))
+            last = event['id']
+    finally:
+        bus.unsubscribe(queue)
+
+    return response
+
+
+async def find_final_tx(request: Request, tx_hash: str) -> Optional[dict]:
+    """Returns a crawled transaction of a finalized block, shaped as the feeder gateway would."""
+    async with request.config_dict['async_session']() as session:
+        from fluence.models import Transaction, Block
+        from fluence.models.Block import STATUS_FINAL
+
+        # Hashes are only unique per partition, so a transaction crawled twice resolves to its latest block.
+        row = (await session.execute(
+            select(Transaction, Block.hash, Block.status).
+            join(Transaction.block).
+            where(Transaction.hash == tx_hash).
+            where(Block.status.in_(STATUS_FINAL)).
+            order_by(desc(Transaction.block_number)).
+            limit(1))).first()
+        if row is None:
+            return None
+
+        tx, block_hash, block_status = row
+
+    return {
+        'block_hash': block_hash,
+        'status': block_status,
+        'transaction': {
+            'entry_point_selector': tx.entry_point_selector,
+            'entry_point_type': tx.entry_point_type,
+            'calldata': tx.calldata,
+        },
+    }
+
+
 async def upload(request: Request):
     import hashlib
     import mimetypes
+    import tempfile
     import aiohttp.hdrs
 
+    # Content-Length counts the multipart framing too, so the limit is enforced on the bytes written.
+    max_size = request.config_dict['upload_max_size']
     reader = await request.multipart()
     part = await reader.next()
     if part.name != 'asset':
@@ -522,34 +974,279 @@ async def upload(request: Request):
     if not extension:
         return web.HTTPBadRequest()
 
-    data = await part.read()
-    asset = f'{hashlib.sha1(data).hexdigest()}{extension}'
-    file = request.config_dict['bucket_root'] / asset[:2] / asset[2:4] / asset
+    loop = asyncio.get_running_loop()
+    bucket_root = request.config_dict['bucket_root']
+    f = await loop.run_in_executor(None, functools.partial(
+        tempfile.NamedTemporaryFile, dir=bucket_root, prefix='.upload-', delete=False))
+    try:
+        sha1 = hashlib.sha1()
+        size = 0
+        while chunk := await part.read_chunk(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                return web.HTTPRequestEntityTooLarge(max_size, size)
+
+            sha1.update(chunk)
+            await loop.run_in_executor(None, f.write, chunk)
+
+        await loop.run_in_executor(None, f.close)
+        asset = f'{sha1.hexdigest()}{extension}'
+        file = bucket_root / asset[:2] / asset[2:4] / asset
+        await loop.run_in_executor(None, store_asset, f.name, file)
+    finally:
+        await loop.run_in_executor(None, discard_upload, f)
+
+    thumbnails = None
+    if extension in RASTER_EXTENSIONS:
+        # A known asset is answered without taking a pool slot, once its thumbnails exist.
+        names = {str(size): thumbnail_name(asset, size) for size in SIZES}
+        if all(file.with_name(name).is_file() for name in names.values()):
+            thumbnails = names
+        else:
+            try:
+                thumbnails = await loop.run_in_executor(request.config_dict['thumbnailer'], make_thumbnails, file)
+            except (OSError, ValueError) as e:
+                logging.warning(e)
+
+    return web.json_response({'asset': asset, 'thumbnails': thumbnails})
+
+
+def store_asset(temp: str, file: Path):
+    """Moves an upload into its content-addressed path, keeping the existing copy of a known asset."""
+    import gzip
+    import mimetypes
+    import shutil
+
+    if file.exists():
+        return
+
     file.parent.mkdir(parents=True, exist_ok=True)
-    with file.open('wb') as f:
-        f.write(data)
+    content_type, _ = mimetypes.guess_type(file.name)
+    if content_type in COMPRESSIBLE_TYPES or (content_type or '').startswith('text/'):
+        with open(temp, 'rb') as src, gzip.open(f'{temp}.gz', 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(f'{temp}.gz', file.with_name(f'{file.name}.gz'))
+
+    os.replace(temp, file)
+
+
+def discard_upload(f):
+    f.close()
+    Path(f.name).unlink(missing_ok=True)
+    Path(f'{f.name}.gz').unlink(missing_ok=True)
+
+
+async def get_asset(request: Request):
+    import re
+
+    asset = request.match_info['asset']
+    match = re.fullmatch(r'(([0-9a-f]{40})(?:_(\d+))?)\.(\w+)', asset)
+    if not match or request.match_info['prefix'] != asset[:2] or request.match_info['infix'] != asset[2:4]:
+        return web.HTTPNotFound()
+    if match[3] and match[4] != 'webp':
+        return web.HTTPNotFound()
+
+    headers = {hdrs.CACHE_CONTROL: ASSET_CACHE_CONTROL}
+    digest = match[1]
+    file = request.config_dict['bucket_root'] / asset[:2] / asset[2:4] / asset
+    if not file.is_file():
+        # Thumbnails of assets uploaded before they were introduced are made on first request.
+        original = match[3] and int(match[3]) in SIZES and find_original(file, match[2])
+        if not original:
+            return web.HTTPNotFound()
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                request.config_dict['thumbnailer'], make_thumbnails, original)
+        except (OSError, ValueError) as e:
+            logging.warning(e)
+            return web.HTTPNotFound()
+    if any(etag.value in (digest, ETAG_ANY) for etag in request.if_none_match or []):
+        return web.HTTPNotModified(headers={**headers, hdrs.ETAG: f'"{digest}"'})
+    if file.with_name(f'{file.name}.gz').is_file():
+        headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+    return AssetResponse(file, digest, headers=headers)
+
 
-    return web.json_response({'asset': asset})
+class AssetResponse(web.FileResponse):
+    """Serves a content-addressed asset, tagged with its digest instead of its mtime."""
 
+    def __init__(self, path: Path, digest: str, **kwargs):
+        super().__init__(path, **kwargs)
+        self._digest = digest
 
-def authenticate(message: list[Union[int, str, bytes]], signature: list[str], stark_key: int) -> bool:
+    @property
+    def etag(self):
+        return super().etag
+
+    @etag.setter
+    def etag(self, _value):
+        # The gzip variant is only semantically equivalent to the original, hence weak.
+        web.FileResponse.etag.fset(
+            self, ETag(value=self._digest, is_weak=hdrs.CONTENT_ENCODING in self.headers))
+
+
+def local_block_number(request: Request, context) -> Optional[int]:
+    """Returns the last interpreted block if the request opted into, and may be answered from, the local index."""
+    if context.parameters.query.get('consistency', 'latest') != 'local':
+        return None
+
+    state = request.config_dict['state']
+    if state.lag is None or state.lag > request.config_dict['local_state_max_lag']:
+        return None
+
+    return state.block_counter - 1
+
+
+def paginate(stmt, key, page: int, size: int, after: Optional[str]):
+    if after:
+        # A cursor already says where the page starts.
+        if page != 1:
+            raise web.HTTPBadRequest()
+        try:
+            last, = decode_cursor(after)
+        except ValueError:
+            raise web.HTTPBadRequest()
+        if not isinstance(last, int):
+            raise web.HTTPBadRequest()
+
+        return stmt.where(key < last).order_by(desc(key)).limit(size)
+
+    return stmt.order_by(desc(key)).limit(size).offset(size * (page - 1))
+
+
+def load_limit_order() -> tuple:
+    from fluence.models import LimitOrder, Token, TokenContract, Blueprint
+
+    return (
+        selectinload(LimitOrder.user),
+        selectinload(LimitOrder.token).
+        selectinload(Token.contract).
+        selectinload(TokenContract.blueprint).
+        selectinload(Blueprint.minter),
+        selectinload(LimitOrder.quote_contract).
+        selectinload(TokenContract.blueprint).
+        selectinload(Blueprint.minter),
+    )
+
+
+def paginate_sorted(stmt, value, key, page: int, size: int, after: Optional[str]):
+    """Like `paginate`, ordered by `value` first, which the cursor of `next_sorted_cursor` carries along."""
+    if after:
+        if page != 1:
+            raise web.HTTPBadRequest()
+        try:
+            last_value, last = decode_cursor(after)
+            if isinstance(last_value, str):
+                last_value = Decimal(last_value)
+        except (ValueError, ArithmeticError):
+            raise web.HTTPBadRequest()
+        if not isinstance(last_value, (int, float, Decimal)) or not isinstance(last, int):
+            raise web.HTTPBadRequest()
+
+        return stmt.where(tuple_(value, key) < tuple_(last_value, last)).order_by(desc(value), desc(key)).limit(size)
+
+    return stmt.order_by(desc(value), desc(key)).limit(size).offset(size * (page - 1))
+
+
+def next_cursor(rows: list, size: int) -> Optional[str]:
+    return encode_cursor(rows[-1].id) if rows and len(rows) == size else None
+
+
+def next_sorted_cursor(rows: list, size: int, value, key=lambda row: row.id) -> Optional[str]:
+    if not rows or len(rows) < size:
+        return None
+
+    last_value = value(rows[-1])
+    return encode_cursor(str(last_value) if isinstance(last_value, Decimal) else last_value, key(rows[-1]))
+
+
+def cached_response(request: Request, key: tuple) -> Optional[web.Response]:
+    body = request.config_dict['response_cache'].get(key)
+    if body is None:
+        return None
+
+    return web.Response(body=body, content_type='application/json')
+
+
+def cache_response(request: Request, key: tuple, data: dict) -> web.Response:
+    body = dumps(data)
+    request.config_dict['response_cache'].put(key, body)
+
+    return web.Response(body=body, content_type='application/json')
+
+
+def cache_metadata(request: Request, key: tuple, nonce: int, document: Optional[dict]) -> tuple[str, bytes]:
     import hashlib
+    import json
+
+    body = json.dumps(document).encode()
+    etag = f'{nonce}-{hashlib.sha1(body).hexdigest()}'
+    request.config_dict['metadata_cache'].put(key, (etag, body))
+
+    return etag, body
+
+
+def metadata_response(request: Request, etag: str, body: bytes) -> web.StreamResponse:
+    headers = {
+        hdrs.ETAG: f'"{etag}"',
+        hdrs.CACHE_CONTROL: f"public, max-age={request.config_dict['metadata_max_age']}",
+    }
+    if request.if_none_match and any(e.value in (etag, '*') for e in request.if_none_match):
+        return web.HTTPNotModified(headers=headers)
+
+    return web.Response(body=body, content_type='application/json', headers=headers)
+
+
+async def count_total(request: Request, session, key: tuple, count, table=None) -> int:
+    if table is not None:
+        reltuples = (await session.execute(
+            text('SELECT reltuples FROM pg_class WHERE oid = CAST(:relname AS regclass)').
+            bindparams(relname=table.name))).scalar_one()
+        if reltuples >= 0:
+            return int(reltuples)
 
-    message_hash = functools.reduce(
-        lambda a, b: pedersen_hash(b, a),
-        map(lambda x:
-            parse_int(x) if not isinstance(x, bytes) else
-            int.from_bytes(hashlib.sha1(x).digest(), byteorder='big'),
-            reversed(message)), 0)
-    r, s = map(parse_int, signature)
+    cache = request.config_dict['total_cache']
+    total = cache.get(key)
+    if total is None:
+        total = (await session.execute(count)).scalar_one()
+        cache.put(key, total)
 
-    return verify(message_hash, r, s, stark_key)
+    return total
+
+
+async def verify_signatures(app: web.Application):
+    yield
+    app['verifier'].shutdown()
+
+
+async def generate_thumbnails(app: web.Application):
+    yield
+    app['thumbnailer'].shutdown(cancel_futures=True)
+
+
+async def watch_state(app: web.Application):
+    task = asyncio.create_task(app['state'].run())
+    yield
+    task.cancel()
+
+
+async def track_txs(app: web.Application):
+    task = asyncio.create_task(app['tracker'].run())
+    yield
+    task.cancel()
+
+
+async def tail_events(app: web.Application):
+    task = asyncio.create_task(app['events'].run())
+    yield
+    task.cancel()
 
 
 @click.command()
 @click.option('--port', default=4000, type=int)
 def serve(port: int):
-    from pathlib import Path
     from .services import async_session
 
     app = web.Application()
@@ -566,17 +1263,65 @@ def serve(port: int):
     app['feeder_gateway'] = FeederGatewayClient(
         url=config('FEEDER_GATEWAY_URL'),
         retry_config=RetryConfig(n_retries=1))
+    app['feeder_calls'] = SingleFlight()
     app['fluence'] = StarkFluence(
         config('STARK_FLUENCE_CONTRACT_ADDRESS', cast=parse_int),
         app['feeder_gateway'],
         GatewayClient(
             url=config('GATEWAY_URL'),
-            retry_config=RetryConfig(n_retries=1)))
+            retry_config=RetryConfig(n_retries=1)),
+        config('FEEDER_CACHE_SIZE', default=4096, cast=int),
+        config('FEEDER_CACHE_TTL', default=5, cast=float))
     app['async_session'] = async_session
+    app['verifier'] = Verifier(
+        config('VERIFIER_WORKERS', default=0, cast=int) or None,
+        config('VERIFIER_BACKLOG', default=256, cast=int),
+        config('VERIFIER_CACHE_SIZE', default=4096, cast=int),
+        config('VERIFIER_CACHE_TTL', default=60, cast=float))
+    app.cleanup_ctx.append(verify_signatures)
+    app['total_cache'] = LRUCache(
+        config('TOTAL_CACHE_SIZE', default=1024, cast=int),
+        config('TOTAL_CACHE_TTL', default=5, cast=float))
+    app['metadata_cache'] = LRUCache(
+        config('METADATA_CACHE_SIZE', default=65536, cast=int),
+        config('METADATA_CACHE_TTL', default=300, cast=float))
+    app['metadata_max_age'] = config('METADATA_MAX_AGE', default=60, cast=int)
+    app['state'] = StateWatcher(async_session, config('STATE_POLL_INTERVAL', default=1, cast=float))
+    app['local_state_max_lag'] = config('LOCAL_STATE_MAX_LAG', default=2, cast=int)
+    # Keys carry the state version, so entries of past versions are never hit again and age out. Writes only
+    # bump the version of this process: the TTLs bound how long other workers serve what they cached before.
+    app['response_cache'] = LRUCache(
+        config('RESPONSE_CACHE_BYTES', default=1 << 26, cast=int),
+        config('RESPONSE_CACHE_TTL', default=60, cast=float),
+        weigh=len)
+    app['state'].subscribe(app['fluence'].invalidate)
+    app.cleanup_ctx.append(watch_state)
+
+    app['tracker'] = TxTracker(
+        app['feeder_gateway'],
+        config('TRACKER_INTERVAL', default=1, cast=float),
+        config('TRACKER_MAX_INTERVAL', default=30, cast=float),
+        config('TRACKER_CONCURRENCY', default=16, cast=int),
+        config('TRACKER_EXPIRE', default=3600, cast=float),
+        config('TRACKER_MAX_WATCHED', default=10000, cast=int))
+    app['keep_alive'] = config('SSE_KEEP_ALIVE', default=15, cast=float)
+    app.cleanup_ctx.append(track_txs)
+    app['replay_batch'] = config('EVENT_BATCH', default=500, cast=int)
+    app['events'] = EventBus(
+        async_session,
+        config('EVENT_POLL_INTERVAL', default=1, cast=float),
+        app['replay_batch'],
+        config('EVENT_BACKLOG', default=1000, cast=int))
+    app.cleanup_ctx.append(tail_events)
+    app.add_routes([web.get('/v1/tx/{hash:0x[0-9a-fA-F]{1,64}}/_events', watch_tx),
+                    web.get('/v1/events', watch_events)])
 
     app['bucket_root'] = Path(config('BUCKET_ROOT'))
+    app['upload_max_size'] = config('UPLOAD_MAX_SIZE', default=1 << 25, cast=int)
+    app['thumbnailer'] = ProcessPoolExecutor(config('THUMBNAIL_WORKERS', default=0, cast=int) or None)
+    app.cleanup_ctx.append(generate_thumbnails)
     app.add_routes([web.post('/fs', upload),
-                    web.static('/fs', app['bucket_root'])])
+                    web.get('/fs/{prefix}/{infix}/{asset}', get_asset)])
 
     from yaml import load
     try:
@@ -0,0 +1,58 @@
+import asyncio
+import functools
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union, Optional
+
+from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash
+from starkware.crypto.signature.signature import verify
+
+from fluence.cache import LRUCache, SingleFlight
+from fluence.utils import parse_int
+
+
+def message_hash(message: list[Union[int, str, bytes]]) -> int:
+    return functools.reduce(
+        lambda a, b: pedersen_hash(b, a),
+        map(lambda x:
+            parse_int(x) if not isinstance(x, bytes) else
+            int.from_bytes(hashlib.sha1(x).digest(), byteorder='big'),
+            reversed(message)), 0)
+
+
+def authenticate(message: list[Union[int, str, bytes]], signature: list[str], stark_key: int) -> bool:
+    r, s = map(parse_int, signature)
+
+    return verify(message_hash(message), r, s, stark_key)
+
+
+class Verifier:
+    """Runs `authenticate` in a bounded process pool, caching recent results."""
+
+    def __init__(self, max_workers: Optional[int], backlog: int, cache_size: int, cache_ttl: float):
+        self._executor = ProcessPoolExecutor(max_workers)
+        self._semaphore = asyncio.Semaphore(backlog)
+        self._cache = LRUCache(cache_size, cache_ttl)
+        self._calls = SingleFlight()
+
+    async def authenticate(
+            self,
+            message: list[Union[int, str, bytes]],
+            signature: list[str],
+            stark_key: int) -> bool:
+        key = tuple(message), tuple(signature), stark_key
+        result = self._cache.get(key)
+        if result is None:
+            result = await self._calls.do(
+                key, lambda: self._authenticate(list(message), list(signature), stark_key))
+            self._cache.put(key, result)
+
+        return result
+
+    async def _authenticate(self, message, signature, stark_key) -> bool:
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, authenticate, message, signature, stark_key)
+
+    def shutdown(self):
+        self._executor.shutdown(cancel_futures=True)
@@ -0,0 +1,30 @@
+import json
+from typing import Optional
+
+from aiohttp import web, hdrs
+from aiohttp.web_request import Request
+
+
+async def open_stream(request: Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={
+        hdrs.CONTENT_TYPE: 'text/event-stream',
+        hdrs.CACHE_CONTROL: 'no-cache',
+    })
+    await response.prepare(request)
+
+    return response
+
+
+async def send(response: web.StreamResponse, data, event: Optional[str] = None, id_: Optional[str] = None):
+    message = ''
+    if id_ is not None:
+        message += f'id: {id_}\n'
+    if event is not None:
+        message += f'event: {event}\n'
+    message += f'data: {json.dumps(data)}\n\n'
+
+    await response.write(message.encode())
+
+
+async def keep_alive(response: web.StreamResponse):
+    await response.write(b': keep-alive\n\n')
@@ -83,3 +83,43 @@ def sign_stark_inputs(private_key: int, inputs: [str]):
         lambda x, y: pedersen_hash(y, x),
         reversed([int(x, 16) if x.startswith('0x') else int(x) for x in inputs]), 0)
     print(sign(msg_hash=message_hash, priv_key=private_key))
+
+
+@cli.command('bench')
+@click.option('-n', '--count', default=200)
+@click.option('--workers', default=0)
+@click.option('--concurrency', default=32)
+def bench_verify(count: int, workers: int, concurrency: int):
+    import asyncio
+    import time
+
+    from fluence.signature import Verifier, authenticate, message_hash
+
+    private_key = int.from_bytes(os.urandom(32), byteorder='big') % EC_ORDER
+    stark_key = private_to_stark_key(private_key)
+    messages = [[i, b'bench'] for i in range(count)]
+    signatures = [['%d' % x for x in sign(message_hash(m), private_key)] for m in messages]
+
+    started = time.perf_counter()
+    for m, sig in zip(messages, signatures):
+        assert authenticate(m, sig, stark_key)
+    print(f'inline: {count / (time.perf_counter() - started):.1f} verifications/s')
+
+    async def run():
+        verifier = Verifier(workers or None, concurrency, 0, 0)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(m, sig):
+            async with semaphore:
+                assert await verifier.authenticate(m, sig, stark_key)
+
+        # Warm up the workers so process start-up is not measured.
+        await asyncio.gather(*(one(m, sig) for m, sig in zip(messages[:concurrency], signatures)))
+        started = time.perf_counter()
+        await asyncio.gather(*(one(m, sig) for m, sig in zip(messages, signatures)))
+        elapsed = time.perf_counter() - started
+        verifier.shutdown()
+
+        return elapsed
+
+    print(f'pool (concurrency {concurrency}): {count / asyncio.run(run()):.1f} verifications/s')
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import functions
+
+from fluence.models import StarkContract, Block
+
+
+class StateWatcher:
+    def __init__(self, async_session: sessionmaker, interval: float):
+        self.block_counter: Optional[int] = None
+        self.head: Optional[int] = None
+        self.write_counter = 0
+        self._async_session = async_session
+        self._interval = interval
+        self._listeners: list[Callable[[], None]] = []
+
+    @property
+    def version(self) -> tuple[Optional[int], int]:
+        return self.block_counter, self.write_counter
+
+    @property
+    def lag(self) -> Optional[int]:
+        if self.block_counter is None or self.head is None:
+            return None
+
+        return max(self.head + 1 - self.block_counter, 0)
+
+    def subscribe(self, listener: Callable[[], None]):
+        self._listeners.append(listener)
+
+    def bump(self):
+        self.write_counter += 1
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                # Anything short of cancellation is retried, so the loop never ends silently.
+                logging.exception(e)
+
+            await asyncio.sleep(self._interval)
+
+    async def poll(self):
+        async with self._async_session() as session:
+            block_counter = (await session.execute(
+                select(functions.max(StarkContract.block_counter)))).scalar_one()
+            head = (await session.execute(
+                select(functions.max(Block.id)))).scalar_one()
+
+        if (block_counter, head) != (self.block_counter, self.head):
+            self.block_counter, self.head = block_counter, head
+            for listener in self._listeners:
+                listener()
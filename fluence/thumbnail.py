@@ -0,0 +1,54 @@
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+SIZES = [128, 512]
+RASTER_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.webp', '.bmp']
+
+
+def thumbnail_name(asset: str, size: int) -> str:
+    digest, _extension = asset.split('.', 1)
+
+    return f'{digest}_{size}.webp'
+
+
+def thumbnail_urls(image: Optional[str]) -> Optional[dict[str, str]]:
+    """Maps each thumbnail size to its URL if `image` points at a raster asset in the bucket."""
+    match = image and re.fullmatch(r'(.*/([0-9a-f]{2})/([0-9a-f]{2})/)(\2\3[0-9a-f]{36})(\.\w+)', image)
+    if not match or match[5].lower() not in RASTER_EXTENSIONS:
+        return None
+
+    return {str(size): f'{match[1]}{match[4]}_{size}.webp' for size in SIZES}
+
+
+def find_original(file: Path, digest: str) -> Optional[Path]:
+    return next((f for f in file.parent.glob(f'{digest}.*') if f.suffix.lower() in RASTER_EXTENSIONS), None)
+
+
+def make_thumbnails(file: Path) -> dict[str, str]:
+    """Writes the WebP thumbnails of `file` next to it, keeping the ones that already exist.
+
+    Raises `ValueError` if `file` is not an image Pillow identifies or is too large to decode safely.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    thumbnails = {}
+    try:
+        with Image.open(file) as image:
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if image.mode in ('P', 'LA', 'RGBA') else 'RGB')
+            for size in SIZES:
+                target = file.with_name(thumbnail_name(file.name, size))
+                if not target.exists():
+                    thumbnail = image.copy()
+                    thumbnail.thumbnail((size, size), Image.LANCZOS)
+                    temp = target.with_name(f'.{target.name}')
+                    thumbnail.save(temp, 'WEBP', quality=80, method=4)
+                    os.replace(temp, target)
+
+                thumbnails[str(size)] = target.name
+    except (UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise ValueError(str(e)) from e
+
+    return thumbnails
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+
+from services.external_api.base_client import BadRequest
+from starkware.starknet.services.api.feeder_gateway.feeder_gateway_client import FeederGatewayClient
+
+STATUS_TERMINAL = ['ACCEPTED_ON_L1', 'REJECTED']
+
+
+class TrackerFull(Exception):
+    pass
+
+
+class TxTracker:
+    """Polls the status of watched transactions in a single loop and pushes transitions to subscribers."""
+
+    def __init__(
+            self,
+            feeder: FeederGatewayClient,
+            interval: float,
+            max_interval: float,
+            concurrency: int,
+            expire: float,
+            max_watched: int):
+        self._feeder = feeder
+        self._interval = interval
+        self._max_interval = max_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._expire = expire
+        self._max_watched = max_watched
+        # Hash -> (expire at, last status, submitted here).
+        self._watched: dict[str, tuple[float, Optional[dict], bool]] = {}
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def track(self, tx_hash: str, submitted: bool = True):
+        if tx_hash in self._watched:
+            if submitted:
+                expire_at, status, _submitted = self._watched[tx_hash]
+                self._watched[tx_hash] = expire_at, status, True
+        elif submitted or len(self._watched) < self._max_watched:
+            self._watched[tx_hash] = time.monotonic() + self._expire, None, submitted
+        else:
+            raise TrackerFull(tx_hash)
+
+    def subscribe(self, tx_hash: str) -> asyncio.Queue:
+        """Returns a queue of status documents, closed with `None` once the status is final.
+
+        Raises `TrackerFull` if the hash is not watched yet and no more hashes can be.
+        """
+        self.track(tx_hash, submitted=False)
+        queue = asyncio.Queue()
+        self._subscribers[tx_hash].add(queue)
+
+        _expire_at, status, _submitted = self._watched[tx_hash]
+        if status is not None:
+            queue.put_nowait(status)
+
+        return queue
+
+    def unsubscribe(self, tx_hash: str, queue: asyncio.Queue):
+        self._subscribers[tx_hash].discard(queue)
+        if not self._subscribers[tx_hash]:
+            del self._subscribers[tx_hash]
+            # Hashes nobody submitted here are only polled for as long as someone listens.
+            if tx_hash in self._watched and not self._watched[tx_hash][2]:
+                del self._watched[tx_hash]
+
+    async def run(self):
+        interval = self._interval
+        while True:
+            await asyncio.sleep(interval)
+
+            try:
+                failures = await self.poll()
+            except Exception as e:
+                logging.exception(e)
+                failures = 1
+            interval = min(interval * 2, self._max_interval) if failures else self._interval
+
+    async def poll(self) -> int:
+        """Returns the number of statuses that could not be fetched for transport reasons."""
+        hashes = list(self._watched)
+        statuses = await asyncio.gather(*map(self._get_status, hashes), return_exceptions=True)
+
+        now = time.monotonic()
+        failures = 0
+        for tx_hash, status in zip(hashes, statuses):
+            if tx_hash not in self._watched:
+                continue
+
+            expire_at, last_status, submitted = self._watched[tx_hash]
+            if isinstance(status, BadRequest):
+                # The feeder will never know this hash, so nobody gets to wait on it.
+                logging.warning(status)
+                del self._watched[tx_hash]
+                self._publish(tx_hash, None)
+                continue
+            if isinstance(status, Exception):
+                logging.warning(status)
+                failures += 1
+                status = None
+            elif status != last_status:
+                self._watched[tx_hash] = expire_at, status, submitted
+                self._publish(tx_hash, status)
+
+            if (status or last_status or {}).get('tx_status') in STATUS_TERMINAL or expire_at < now:
+                del self._watched[tx_hash]
+                self._publish(tx_hash, None)
+
+        return failures
+
+    async def _get_status(self, tx_hash: str) -> dict:
+        async with self._semaphore:
+            status = await self._feeder.get_transaction_status(tx_hash=tx_hash)
+
+        return {'transaction_hash': tx_hash, **status}
+
+    def _publish(self, tx_hash: str, status: Optional[dict]):
+        for queue in self._subscribers.get(tx_hash, []):
+            queue.put_nowait(status)
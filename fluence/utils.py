@@ -1,6 +1,9 @@
+import base64
+import json
 from typing import Union
 
 from eth_typing import ChecksumAddress
+from sqlalchemy import inspect
 from web3 import Web3
 
 
@@ -12,4 +15,26 @@ def to_checksum_address(address) -> ChecksumAddress:
     return Web3.toChecksumAddress('%040x' % parse_int(address))
 
 
+def encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError(f'invalid cursor: {cursor}') from e
+    if not isinstance(values, list):
+        raise ValueError(f'invalid cursor: {cursor}')
+
+    return values
+
+
+def is_loaded(obj, key: str) -> bool:
+    """Whether reading `key` of `obj` needs no lazy load; always true of plain rows."""
+    state = inspect(obj, raiseerr=False)
+
+    return state is None or key not in state.unloaded
+
+
 ZERO_ADDRESS = to_checksum_address(0)
@@ -17,12 +17,16 @@ setup(
         'jsonschema',
         'marshmallow',
         'pendulum',
+        'Pillow',
         'py-eth-sig-utils',
         'python-decouple',
         'PyYAML',
         'rororo',
         'sqlalchemy',
     ],
+    extras_require={
+        'fast': ['orjson'],
+    },
     entry_points={
         'console_scripts': [
             'crawl = fluence.crawl:crawl',